@@ -9,6 +9,7 @@ import os
 from pathlib import Path
 import shutil
 import ssl
+import threading
 from typing import Callable, Literal
 import urllib.error
 from urllib.request import urlopen
@@ -142,7 +143,11 @@ def download(url: str, file_path: str | Path, callback: Callable | None = None)
 
     if isinstance(file_path, str):
         file_path = Path(file_path)
-    tmp_file_path = file_path.with_suffix(f"{file_path.suffix}.tmp")
+    # Make the temporary file unique to the thread so that concurrent downloads of the
+    # same file (e.g., two jobs needing the same mask) do not write over each other.
+    tmp_file_path = file_path.with_suffix(
+        f"{file_path.suffix}.{threading.get_ident()}.tmp"
+    )
 
     # Allen SSL certificate is apparently not valid...
     context = get_ssl_context(check_hostname=False, check_certificate=False)
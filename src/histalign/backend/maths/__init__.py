@@ -24,6 +24,9 @@ from histalign.backend.models.errors import InvalidOrientationError
 
 _module_logger = logging.getLogger(__name__)
 
+# Number of elements normalised at a time so the float64 temporaries stay cache-sized
+_NORMALISATION_CHUNK_SIZE = 2**20
+
 
 def apply_rotation(vector: np.ndarray, settings: VolumeSettings) -> np.ndarray:
     """Rotates a 3D vector by the recreating the rotation from alignment settings.
@@ -393,7 +396,12 @@ def get_sk_transform_from_parameters(
 
 
 def normalise_array(
-    array: np.ndarray, dtype: Optional[np.dtype] = None, fast: bool = False
+    array: np.ndarray,
+    dtype: Optional[np.dtype] = None,
+    fast: bool = False,
+    out: Optional[np.ndarray] = None,
+    minimum: Optional[float] = None,
+    maximum: Optional[float] = None,
 ) -> np.ndarray:
     """Normalise an array to the range between 0 and the dtype's maximum value.
 
@@ -404,27 +412,69 @@ def normalise_array(
         fast (bool, optional):
             Whether to normalise without using intermediary float arrays. This will lead
             to reduced accuracy but no extra memory usage.
+        out (Optional[np.ndarray], optional):
+            Array to write the result to instead of allocating a new one. It should have
+            the shape of `array` and the target dtype, and can be `array` itself to
+            normalise in-place. Ignored when `fast` is set as that is always in-place.
+        minimum (Optional[float], optional):
+            Minimum of `array` if it is already known. Computed otherwise.
+        maximum (Optional[float], optional):
+            Maximum of `array` if it is already known. Computed otherwise.
 
     Returns:
         The normalised array.
     """
     dtype = dtype or array.dtype
-    maximum = get_dtype_maximum(dtype)
+    dtype_maximum = get_dtype_maximum(dtype)
 
     if fast:
         array -= array.min()
-        ratio = array.max() // maximum
+        ratio = array.max() // dtype_maximum
         if ratio > 1:
             array[:] //= int(ratio)
         else:
             array[:] *= np.max(1, int(ratio))
-    else:
+    elif array.ndim == 0 or array.size == 0:
         array = array.astype(np.float64)
         array -= array.min()
         array /= max(array.max(), 1)
-        array *= maximum
-
-    return array.astype(dtype)
+        array *= dtype_maximum
+        if out is not None:
+            out[...] = array
+            return out
+    else:
+        # Compute the range on the input then convert, shift, and scale it in chunks
+        # along the first axis. This reads the input once more but avoids allocating
+        # and repeatedly going over a float64 copy of the whole array. The results are
+        # identical as the float64 conversion preserves ordering.
+        # Float32 targets cannot hold more precision than float32 maths provides so
+        # are worked out in float32, halving the traffic over the temporaries. Each
+        # chunk is read before being written so `out` can alias `array`.
+        working_dtype = np.float32 if np.dtype(dtype) == np.float32 else np.float64
+        if minimum is None:
+            minimum = array.min()
+        if maximum is None:
+            maximum = array.max()
+        minimum = working_dtype(minimum)
+        value_range = working_dtype(max(np.float64(maximum) - minimum, 1))
+
+        if out is None:
+            # Force C order so that transposed views come out contiguous
+            out = np.empty(array.shape, dtype=dtype, order="C")
+
+        step = max(_NORMALISATION_CHUNK_SIZE // (array.size // array.shape[0]), 1)
+        for start in range(0, array.shape[0], step):
+            chunk = array[start : start + step].astype(working_dtype)
+            np.subtract(chunk, minimum, out=chunk)
+            np.divide(chunk, value_range, out=chunk)
+            np.multiply(chunk, working_dtype(dtype_maximum), out=chunk)
+
+            out[start : start + step] = chunk
+
+        return out
+
+    # Both paths above already own `array` so there is no need to copy it again
+    return array.astype(dtype, copy=False)
 
 
 def signed_vector_angle(
@@ -157,13 +157,16 @@ class QuantificationThread(QtCore.QThread):
         for i, (path, handle) in enumerate(input_handles.items()):
             array = handle.load()
 
+            # All masks share the atlas shape so the slicing geometry can be reused
+            geometry = None
             for structure in settings.structures:
                 if settings.on_volume:
                     mask = masks[structure].volume.tonumpy()
                 else:
-                    mask = masks[structure].slice(
-                        alignment_settings_list[i].volume_settings
-                    )
+                    volume_settings = alignment_settings_list[i].volume_settings
+                    if geometry is None:
+                        geometry = masks[structure].compute_geometry(volume_settings)
+                    mask = masks[structure].slice(volume_settings, geometry=geometry)
 
                 start_time = perf_counter()
                 results.loc[len(results)] = dict(
@@ -28,13 +28,18 @@ from histalign.backend.maths import (
     compute_origin,
 )
 from histalign.backend.models import (
-    AlignmentSettings,
     Orientation,
     Resolution,
     VolumeSettings,
 )
 from histalign.backend.registration import Registrator
-from histalign.io import DATA_ROOT, gather_alignment_paths, load_image, load_volume
+from histalign.io import (
+    DATA_ROOT,
+    gather_alignment_paths,
+    load_alignment_settings,
+    load_image,
+    load_volume,
+)
 
 ALIGNMENT_VOLUMES_CACHE_DIRECTORY = DATA_ROOT / "alignment_volumes"
 os.makedirs(ALIGNMENT_VOLUMES_CACHE_DIRECTORY, exist_ok=True)
@@ -158,7 +163,7 @@ def build_aligned_array(
             )
 
         # Load the alignment settings
-        settings = AlignmentSettings(**json.load(alignment_path.open()))
+        settings = load_alignment_settings(alignment_path)
 
         # Apply regex substitution to the histology path
         substituted_path = replace_path_parts(
@@ -249,23 +254,48 @@ def build_aligned_array(
         for points in point_clouds:
             # Interpolate and store the result in a temporary array
             tmp_array = query_volume.interpolate_data_from(points, radius=1).tonumpy()
-            tmp_array = np.round(tmp_array).astype(np.uint16)
+            if np.issubdtype(tmp_array.dtype, np.floating):
+                np.round(tmp_array, out=tmp_array)
 
             # TODO: Might be worth thinking of another way to merge. Using the maximum
             #       works fine when working with non-overlapping slices but a mean or
             #       something more robust might make more sense when tmp_array and
             #       alignment_array have common, non-zero points.
-            # Merge the new plane into the master array
-            alignment_array[:] = np.maximum(alignment_array, tmp_array)
+            # Merge the new plane into the master array. Work in-place to avoid
+            # allocating volume-sized temporaries for every slice.
+            np.maximum(alignment_array, tmp_array, out=alignment_array, casting="unsafe")
 
     _module_logger.debug(
         f"Finished gathering slices. Caching result to '{cache_path}'."
     )
     with h5py.File(cache_path, "w") as handle:
-        handle.create_dataset(name="array", data=alignment_array, compression="gzip")
+        handle.create_dataset(
+            name="array",
+            data=alignment_array,
+            chunks=_get_slab_chunks(alignment_array.shape),
+            compression="gzip",
+            shuffle=True,
+        )
     append_volume(alignment_directory, cache_path, "aligned")
 
 
+def _get_slab_chunks(shape: Sequence[int], depth: int = 32) -> tuple[int, ...]:
+    """Computes HDF5 chunks covering slabs of `depth` planes along the first axis.
+
+    Reading the whole volume back is then a sequential pass over a few large chunks
+    rather than seeking between many small ones. Shuffling the bytes of 16-bit data
+    also lets gzip compress and decompress it faster.
+
+    Args:
+        shape (Sequence[int]): Shape of the dataset.
+        depth (int, optional): Number of planes per chunk.
+
+    Returns:
+        The chunk shape.
+    """
+    return (min(depth, shape[0]), *shape[1:])
+
+
 def build_point_cloud(
     origin: Sequence[float], shape: Sequence[int], settings: VolumeSettings
 ) -> vedo.Points:
@@ -416,7 +446,13 @@ def interpolate_sparse_3d_array(
     _module_logger.debug(f"Caching interpolated array to '{cache_path}'.")
     os.makedirs(INTERPOLATED_VOLUMES_CACHE_DIRECTORY, exist_ok=True)
     with h5py.File(cache_path, "w") as handle:
-        handle.create_dataset(name="array", data=interpolated_array, compression="gzip")
+        handle.create_dataset(
+            name="array",
+            data=interpolated_array,
+            chunks=_get_slab_chunks(interpolated_array.shape),
+            compression="gzip",
+            shuffle=True,
+        )
     append_volume(alignment_directory, cache_path, "interpolated")
 
     return interpolated_array
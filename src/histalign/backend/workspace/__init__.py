@@ -426,21 +426,50 @@ class VolumeSlicer:
                 raise ValueError("Either provide a volume or a path and a resolution.")
             self.volume = Volume(path, resolution, convert_dtype, lazy)
 
+    def compute_geometry(
+        self, settings: VolumeSettings, origin: Optional[list[float]] = None
+    ) -> tuple[np.ndarray, np.ndarray, vedo.Plane]:
+        """Computes the slicing geometry for `settings`.
+
+        The geometry only depends on the settings and the shape of the volume. It can
+        therefore be computed once and passed to `slice` for every volume of the same
+        shape sliced with the same settings.
+
+        Args:
+            settings (VolumeSettings): Settings used for alignment.
+            origin (Optional[list[float]], optional): Origin of the slicing plane. If
+                                                      not provided, it is computed
+                                                      from `settings`.
+
+        Returns:
+            The origin, normal, and display plane of the slice.
+        """
+        origin_array = (
+            np.array(origin)
+            if origin
+            else compute_origin(compute_centre(self.volume.shape), settings)
+        )
+        normal = compute_normal(settings)
+        display_plane = self.reproduce_display_plane(origin_array, settings)
+
+        return origin_array, normal, display_plane
+
     def slice(
         self,
         settings: VolumeSettings,
         interpolation: Literal["nearest", "linear", "cubic"] = "cubic",
         return_display_plane: bool = False,
         origin: Optional[list[float]] = None,
+        geometry: Optional[tuple[np.ndarray, np.ndarray, vedo.Plane]] = None,
     ) -> np.ndarray | vedo.Mesh:
-        origin = (
-            np.array(origin)
-            if origin
-            else compute_origin(compute_centre(self.volume.shape), settings)
-        )
-        normal = compute_normal(settings)
+        if geometry is None:
+            geometry = self.compute_geometry(settings, origin)
+        origin_array, normal, display_plane = geometry
+        if return_display_plane:
+            return display_plane
+
         plane_mesh = self.volume.slice_plane(
-            origin=origin.tolist(), normal=normal.tolist(), mode=interpolation
+            origin=origin_array.tolist(), normal=normal.tolist(), mode=interpolation
         )
 
         # vedo cuts down the mesh in a way I don't fully understand. Therefore, the
@@ -448,12 +477,8 @@ class VolumeSlicer:
         # the image that we can recover from mesh when working with an offset and
         # pitch/yaw. Instead, the image in `plane_mesh` is cropped and then padded so
         # that the centre of the image corresponds to the origin.
-        display_plane = self.reproduce_display_plane(origin, settings)
-        if return_display_plane:
-            return display_plane
-
         plane_array = self.crop_and_pad_to_display_plane(
-            plane_mesh, display_plane, origin, normal, settings
+            plane_mesh, display_plane, origin_array, normal, settings
         )
 
         # Correct vedo-specific rotations and apply some custom rotations for
@@ -583,8 +608,8 @@ class VolumeSlicer:
         a, b, d, c = display_plane.points
 
         if orientation == Orientation.SAGITTAL:
-            # Mimic vedo rotation
-            display_plane.rotate(
+            # Mimic vedo rotation. Work on a copy so `display_plane` can be reused.
+            display_plane = display_plane.clone().rotate(
                 signed_vector_angle(a - d, A - D, normal),
                 axis=Rotation.from_euler("XY", [pitch, yaw], degrees=True).apply(
                     [0, 0, 1]
@@ -895,8 +920,7 @@ class Workspace(QtCore.QObject):
         if alignment_path is None:
             return
 
-        with open(alignment_path) as handle:
-            alignment_settings = AlignmentSettings(**json.load(handle))
+        alignment_settings = io.load_alignment_settings(alignment_path)
 
         alignment_settings.volume_settings.offset = int(
             round(
@@ -5,12 +5,13 @@
 from __future__ import annotations
 
 from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
 import itertools
 import json
 import logging
 import math
+import os
 from pathlib import Path
-import re
 import sys
 from typing import Any, Callable, Literal, Optional
 
@@ -38,9 +39,10 @@ from histalign.frontend.pyside_helpers import (
 )
 from histalign.frontend.themes import is_light_colour
 from histalign.io import (
+    ALIGNMENT_FILE_NAME_PATTERN,
     HASHED_DIRECTORY_NAME_PATTERN,
-    is_alignment_file,
     is_empty_directory,
+    list_alignment_directories,
     load_alignment_settings,
 )
 from histalign.io.image import generate_file_hash
@@ -50,6 +52,8 @@ QWIDGETSIZE_MAX = 16777215  # Qt constant
 
 _module_logger = logging.getLogger(__name__)
 
+_THUMBNAIL_BATCH_SIZE = 8
+
 
 class ProjectDirectoriesComboBox(QtWidgets.QComboBox):
     def __init__(self, parent: Optional[QtWidgets.QWidget] = None) -> None:
@@ -58,26 +62,8 @@ class ProjectDirectoriesComboBox(QtWidgets.QComboBox):
     def parse_project(self, project_directory: Path) -> None:
         self.clear()
 
-        for path in project_directory.iterdir():
-            if (
-                path.is_file()
-                or re.fullmatch(HASHED_DIRECTORY_NAME_PATTERN, str(path.name)) is None
-            ):
-                continue
-
-            metadata_path = path / "metadata.json"
-            if not metadata_path.exists():
-                continue
-
-            # Don't list directories that do not have any alignment files
-            for child_path in path.iterdir():
-                if is_alignment_file(child_path):
-                    break
-            else:
-                continue
-
-            with open(metadata_path) as handle:
-                self.addItem(json.load(handle)["directory_path"])
+        # Don't list directories that do not have any alignment files
+        self.addItems(list_alignment_directories(project_directory))
 
 
 class NoFocusRectProxyStyle(QtWidgets.QProxyStyle):
@@ -1133,10 +1119,12 @@ class DynamicThemeIcon(QtGui.QIcon):
         Adapted from: https://stackoverflow.com/a/37213313.
     """
 
+    _cache: dict[tuple[str, int], DynamicThemeIcon] = {}
+
     _pixmap: QtGui.QPixmap
 
     def __init__(self, icon_path: str | Path) -> None:
-        pixmap = QtGui.QPixmap(icon_path)
+        pixmap = _load_cached_pixmap(icon_path)
 
         self._pixmap = pixmap.copy()
 
@@ -1155,6 +1143,29 @@ class DynamicThemeIcon(QtGui.QIcon):
 
         super().__init__(pixmap)
 
+    @classmethod
+    def from_cache(cls, icon_path: str | Path) -> DynamicThemeIcon:
+        """Returns a shared icon for `icon_path`, only rasterising it on first use.
+
+        Icons are keyed on the current text colour so a theme change still produces
+        correctly tinted icons.
+
+        Args:
+            icon_path (str | Path): Path to the icon image.
+
+        Returns:
+            The themed icon.
+        """
+        colour = QtWidgets.QApplication.instance().palette().text().color().rgba()
+        key = (str(icon_path), colour)
+
+        icon = cls._cache.get(key)
+        if icon is None:
+            icon = cls(icon_path)
+            cls._cache[key] = icon
+
+        return icon
+
 
 class ShortcutAwareFilter(QtCore.QObject):
     def __init__(self, parent: Optional[QtWidgets.QWidget] = None) -> None:
@@ -1202,7 +1213,7 @@ class ShortcutAwareToolButton(QtWidgets.QToolButton):
         self.setEnabled(enabled)
 
         if icon_path:
-            self.setIcon(DynamicThemeIcon(icon_path))
+            self.setIcon(DynamicThemeIcon.from_cache(icon_path))
 
         if shortcut is not None:
             self.setShortcut(shortcut)
@@ -1455,7 +1466,7 @@ class Icon(QtWidgets.QPushButton):
 
         #
         if icon_path is not None:
-            self.setIcon(DynamicThemeIcon(icon_path))
+            self.setIcon(DynamicThemeIcon.from_cache(icon_path))
 
     def event(self, e: QtCore.QEvent) -> bool:
         if e.type() != QtCore.QEvent.Type.Paint:
@@ -2407,7 +2418,7 @@ class ResizablePixmapLabel(QtWidgets.QLabel):
         self._pixmap = None
         self._aspect_ratio = 1
 
-        pixmap = QtGui.QPixmap(file_path)
+        pixmap = _load_cached_pixmap(file_path)
 
         if icon_mode:  # Make icon dynamic based on theme
             painter = QtGui.QPainter(pixmap)
@@ -2921,7 +2932,7 @@ class HoverButton(HoverMixIn, QtWidgets.QPushButton):
         )
 
         if icon_path:
-            self.setIcon(DynamicThemeIcon(icon_path))
+            self.setIcon(DynamicThemeIcon.from_cache(icon_path))
 
 
 class CollapsibleWidgetArea(QtWidgets.QWidget):
@@ -3265,7 +3276,9 @@ class ThumbnailWidget(QtWidgets.QFrame):
 
     def set_completed(self, completed: bool) -> None:
         if not completed:
-            self.pixmap_label.setPixmap(QtGui.QPixmap(self.file_path), overwrite=True)
+            self.pixmap_label.setPixmap(
+                _load_cached_pixmap(self.file_path), overwrite=True
+            )
             self.pixmap_label.resize_pixmap()
             return
 
@@ -3803,14 +3816,22 @@ class NavigationArea(QtWidgets.QScrollArea):
             return
 
         path_list = self._folders_2d_widget.path_list
-        for path in self.project_root.iterdir():
-            if re.fullmatch(HASHED_DIRECTORY_NAME_PATTERN, path.name) is None:
-                continue
-
-            try:
-                with open(path / "metadata.json") as handle:
-                    contents = json.load(handle)
-            except FileNotFoundError:
+        # `os.scandir` provides the name and type of each entry without building and
+        # stat-ing a `Path` for every one of them.
+        with os.scandir(self.project_root) as iterator:
+            paths = [
+                Path(entry.path)
+                for entry in iterator
+                if HASHED_DIRECTORY_NAME_PATTERN.fullmatch(entry.name) is not None
+                and entry.is_dir()
+            ]
+
+        # Overlap the disk latency of reading each folder's metadata
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            contents_list = list(executor.map(_read_metadata, paths))
+
+        for path, contents in zip(paths, contents_list):
+            if contents is None:
                 _module_logger.error(
                     f"Could not parse 'metadata.json' file "
                     f"for alignment folder '{path}'."
@@ -3882,28 +3903,44 @@ class NavigationArea(QtWidgets.QScrollArea):
             workspace.parse_image_directory(str(user_friendly_path))
             return self.open_2d_folder(path, original_directory, should_panic=True)
 
-        aligned_paths = []
-        path_index_map = {}
-        for child_path in path.iterdir():
-            if not is_alignment_file(child_path):
-                continue
-
-            aligned_paths.append(child_path)
+        with os.scandir(path) as iterator:
+            alignment_paths = [
+                Path(entry.path)
+                for entry in iterator
+                if ALIGNMENT_FILE_NAME_PATTERN.fullmatch(entry.name) is not None
+                and entry.is_file()
+            ]
 
+        histology_paths = {}
+        for child_path in alignment_paths:
             alignment_settings = load_alignment_settings(child_path)
-            histology_path = alignment_settings.histology_path
-
-            path_index_map[child_path] = slice_order.index(histology_path)
-
-        aligned_paths.sort(key=lambda x: path_index_map[x])
-        for index, path in enumerate(aligned_paths):
-            thumbnail = self._get_thumbnail(path)
+            histology_paths[child_path] = alignment_settings.histology_path
 
-            widget.layout().replaceAt(index, thumbnail)
+        alignment_paths.sort(key=lambda x: slice_order.index(histology_paths[x]))
 
         self.folder_2d_opened.emit(user_friendly_path)
         self.put_on_stack(widget)
 
+        # Populate the thumbnails in small batches from the event loop so that the
+        # folder opens immediately and stays responsive while the rest load. The
+        # timer is parented to the container so it stops if the container is deleted.
+        pending = iter(enumerate(alignment_paths))
+        timer = QtCore.QTimer(widget)
+
+        def populate_batch() -> None:
+            batch = list(itertools.islice(pending, _THUMBNAIL_BATCH_SIZE))
+            for index, alignment_path in batch:
+                widget.layout().replaceAt(
+                    index,
+                    self._get_thumbnail(alignment_path, histology_paths[alignment_path]),
+                )
+
+            if len(batch) < _THUMBNAIL_BATCH_SIZE:
+                timer.stop()
+
+        timer.timeout.connect(populate_batch)
+        timer.start(0)
+
     def reset(self) -> None:
         self._folders_2d_widget.deleteLater()
         self._files_3d_widget.deleteLater()
@@ -3969,10 +4006,9 @@ class NavigationArea(QtWidgets.QScrollArea):
 
         self.widget().setMaximumWidth(self.viewport().width())
 
-    def _get_thumbnail(self, alignment_path: Path) -> ThumbnailWidget:
-        alignment_settings = load_alignment_settings(alignment_path)
-        histology_path = alignment_settings.histology_path
-
+    def _get_thumbnail(
+        self, alignment_path: Path, histology_path: Path
+    ) -> ThumbnailWidget:
         # TODO: Attempt to generate thumbnail in case it was cleared since registration
         #       or at least provide a placeholder.
         thumbnail_path = build_thumbnail_path(
@@ -4084,13 +4120,17 @@ class PreferentialSplitter(QtWidgets.QSplitter):
         # are set on an incorrect total size. The actual size o the widget is either
         # known on the first resize when the widget is outside of a QTabWidget, or on
         # the second when inside of one.
-        if self._resize_index == 0 or (
-            self._resize_index == 1
-            and isinstance(
-                find_parent(self, QtWidgets.QTabWidget), QtWidgets.QTabWidget
-            )
-        ):
-            self._resize_index += 1
+        # Only look at the first two resizes so later ones (e.g., while the user drags
+        # the window border) do not keep walking up the parent chain.
+        if self._resize_index > 1:
+            return
+
+        should_set_sizes = self._resize_index == 0 or isinstance(
+            find_parent(self, QtWidgets.QTabWidget), QtWidgets.QTabWidget
+        )
+        self._resize_index += 1
+
+        if should_set_sizes:
             self.setSizes(self.compute_baseline_sizes())
 
     def eventFilter(self, watched: QtCore.QObject, event: QtCore.QEvent) -> bool:
@@ -4598,3 +4638,41 @@ def file_picker_overwrite_validator(path: str, widget: FilePickerWidget) -> str:
     widget.label.setText(text)
 
     return path
+
+
+def _read_metadata(directory: Path) -> Optional[dict[str, Any]]:
+    """Reads the metadata file of an alignment directory.
+
+    Args:
+        directory (Path): Alignment directory containing a `metadata.json` file.
+
+    Returns:
+        The parsed metadata or `None` if the file does not exist.
+    """
+    try:
+        return json.loads((directory / "metadata.json").read_bytes())
+    except FileNotFoundError:
+        return None
+
+
+def _load_cached_pixmap(file_path: str | Path) -> QtGui.QPixmap:
+    """Loads a pixmap from disk, sharing the decoded image through `QPixmapCache`.
+
+    The returned pixmap is implicitly shared with the cache so painting onto it
+    detaches a copy rather than altering the cached image.
+
+    Args:
+        file_path (str | Path): Path to the image to load.
+
+    Returns:
+        The loaded pixmap. This is a null pixmap if the file could not be read.
+    """
+    pixmap_key = f"_load_cached_pixmap_{file_path}"
+
+    pixmap = QtGui.QPixmap()
+    if not QtGui.QPixmapCache.find(pixmap_key, pixmap):
+        pixmap = QtGui.QPixmap(file_path)
+        if not pixmap.isNull():
+            QtGui.QPixmapCache.insert(pixmap_key, pixmap)
+
+    return pixmap
@@ -6,7 +6,7 @@ from contextlib import suppress
 from typing import Optional, TypeVar
 
 import numpy as np
-from PySide6 import QtGui, QtWidgets
+from PySide6 import QtCore, QtGui, QtWidgets
 
 from histalign.frontend.themes import is_light_colour
 
@@ -114,6 +114,27 @@ def find_parent(widget: QtWidgets.QWidget, parent_type: type[_T]) -> Optional[_T
     return parent
 
 
+def get_inner_margins(frame: QtWidgets.QFrame) -> QtCore.QMargins:
+    """Computes margins aligning content outside a frame with the content inside it.
+
+    Args:
+        frame (QtWidgets.QFrame): Frame to align with.
+
+    Returns:
+        The left, right, and bottom contents margins of the frame minus its frame width
+        and no top margin.
+    """
+    margins = frame.contentsMargins()
+    frame_width = frame.frameWidth()
+
+    return QtCore.QMargins(
+        margins.left() - frame_width,
+        0,
+        margins.right() - frame_width,
+        margins.bottom() - frame_width,
+    )
+
+
 def get_actual_background_colour(widget: QtWidgets.QWidget) -> QtGui.QColor:
     """Computes the real background colour (without autofill) for a widget.
 
@@ -245,6 +266,24 @@ def lua_aware_shift(
 
 def np_to_qimage(
     array: np.ndarray, format: Optional[QtGui.QImage.Format] = None
+) -> QtGui.QImage:
+    return _wrap_array(array.tobytes(), array, format)
+
+
+def np_to_qpixmap(
+    array: np.ndarray, format: Optional[QtGui.QImage.Format] = None
+) -> QtGui.QPixmap:
+    # The pixmap copies the image data, so a temporary QImage can view the array's
+    # buffer directly instead of going through `tobytes`. Only non-contiguous arrays
+    # (e.g., slices along the last axes of a volume) need copying.
+    array = np.ascontiguousarray(array)
+    return QtGui.QPixmap.fromImage(_wrap_array(array.data, array, format))
+
+
+def _wrap_array(
+    buffer: bytes | memoryview,
+    array: np.ndarray,
+    format: Optional[QtGui.QImage.Format] = None,
 ) -> QtGui.QImage:
     if format is None:
         match array.dtype:
@@ -260,7 +299,7 @@ def np_to_qimage(
                 )
 
     return QtGui.QImage(
-        array.tobytes(),
+        buffer,
         array.shape[1],
         array.shape[0],
         array.shape[1] * array.itemsize,
@@ -268,12 +307,6 @@ def np_to_qimage(
     )
 
 
-def np_to_qpixmap(
-    array: np.ndarray, format: Optional[QtGui.QImage.Format] = None
-) -> QtGui.QPixmap:
-    return QtGui.QPixmap.fromImage(np_to_qimage(array, format))
-
-
 def try_show_status_message(
     widget: QtWidgets.QWidget, message: str, duration: int = 2_000
 ) -> bool:
@@ -2,30 +2,56 @@
 #
 # SPDX-License-Identifier: MIT
 
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import logging
+import os
 from pathlib import Path
+import tempfile
 from typing import Optional
 
 import numpy as np
-from PySide6 import QtCore, QtWidgets
+from PySide6 import QtCore, QtGui, QtWidgets
 from scipy.ndimage import gaussian_filter
 
 from histalign.backend.ccf import get_structure_mask_path
-from histalign.backend.maths import normalise_array
 from histalign.backend.models import Resolution
+from histalign.backend.workspace import get_thumbnail_cache_root
 from histalign.frontend.common_widgets import (
     CollapsibleWidgetArea,
     NavigationWidget,
     PreferentialSplitter,
 )
+from histalign.frontend.pyside_helpers import try_show_permanent_status_message
 from histalign.frontend.visualisation.information import InformationWidget
 from histalign.frontend.visualisation.views import SliceViewer, VolumeViewer
 from histalign.io import load_volume
 from histalign.language_helpers import unwrap
 from histalign.resources import ICONS_ROOT
 
+try:
+    import cupy
+    from cupyx.scipy.ndimage import gaussian_filter as cupy_gaussian_filter
+except ImportError:
+    cupy = None
+
 _module_logger = logging.getLogger(__name__)
 
+# Maps 8-bit intensities to 25 uniform levels spread over the 8-bit range. This is
+# equivalent to digitizing with `np.linspace(0, 255, 25)` edges and re-normalising to
+# 8-bit, but done in a single table lookup. 25 levels fit in a byte without any loss.
+_QUANTISATION_TABLE = ((np.arange(256) * 24 // 255) * 255 // 24).astype(np.uint8)
+# A radius of 3 sigma captures >99.7% of the kernel mass while needing far fewer taps
+# than the previous radius of 20.
+_GAUSSIAN_RADIUS = 15
+# Roughly sized to stay within a typical L2 cache
+_QUANTISATION_SLAB_BYTES = 2**20
+# In KiB, as expected by `QPixmapCache.setCacheLimit`
+_PIXMAP_CACHE_LIMIT = 256 * 1024
+# Bump whenever `_preprocess_volume` changes its output so that volumes cached by a
+# previous version are not reused.
+_PREPROCESSING_VERSION = 1
+
 
 class VisualisationWidget(QtWidgets.QWidget):
     project_root: Optional[Path]
@@ -52,12 +78,22 @@ class VisualisationWidget(QtWidgets.QWidget):
         self._saved_left_size = -1
         self._saved_right_size = -1
 
-        self._pixmap_item = None
+        self._volume_thread: Optional[VolumePreprocessorThread] = None
+        self._status_bar_label: Optional[QtWidgets.QLabel] = None
+
+        # Leave enough room for a few folders' worth of thumbnails
+        QtGui.QPixmapCache.setCacheLimit(
+            max(QtGui.QPixmapCache.cacheLimit(), _PIXMAP_CACHE_LIMIT)
+        )
 
         #
         central_view = SliceViewer()
 
         self.central_view = central_view
+        # Keep both kinds of view around so switching between images and volumes
+        # does not have to rebuild scenes and reload the atlas.
+        self._slice_view = central_view
+        self._volume_view: Optional[VolumeViewer] = None
 
         #
         navigation_widget = NavigationWidget()
@@ -112,24 +148,11 @@ class VisualisationWidget(QtWidgets.QWidget):
         self.setLayout(layout)
 
         #
-        self.project_opened.connect(lambda: self.navigation_widget.setEnabled(True))
+        self.project_opened.connect(self.on_project_opened)
         self.project_closed.connect(self.reset)
-        self.project_closed.connect(lambda: self.navigation_widget.setEnabled(False))
-        self.project_closed.connect(
-            lambda: self.information_widget.structures_widget.setEnabled(False)
-        )
-
-        self.image_opened.connect(
-            lambda: self.information_widget.structures_widget.setEnabled(True)
-        )
+        self.project_closed.connect(self.on_project_closed)
 
-    def get_baseline_splitter_sizes(self) -> list[int]:
-        width = (
-            self.splitter.width() - self.splitter.count() * self.splitter.handleWidth()
-        )
-        unit = width // 5  # Split the view in 1-3-1, i.e. multiples of 5ths
-
-        return [unit, 3 * unit, unit]
+        self.image_opened.connect(self.on_image_opened)
 
     @QtCore.Slot()
     def open_project(
@@ -143,55 +166,368 @@ class VisualisationWidget(QtWidgets.QWidget):
 
     @QtCore.Slot()
     def open_image(self, path: Path) -> None:
-        old_view = self.central_view
-        new_view = old_view
-
-        if isinstance(new_view, SliceViewer):
-            new_view.open_image(path)
-        else:
-            new_view = SliceViewer()
+        # Unchecking the previous structures removes their contours one by one
+        self._slice_view.begin_batch()
+        self._slice_view.open_image(path)
         self.information_widget.structures_widget.reset()
+        self._slice_view.end_batch()
 
-        if old_view is not new_view:
-            self.central_view = new_view
-            self.splitter.replaceWidget(1, new_view)
-            old_view.deleteLater()
+        self.set_central_view(self._slice_view)
 
         self.image_opened.emit()
 
     @QtCore.Slot()
     def open_volume(self, path: Path) -> None:
-        old_view = self.central_view
-        new_view = old_view
+        # Drop the results of any preprocessing still running for a previous volume
+        if self._volume_thread is not None:
+            self._volume_thread.should_emit = False
 
-        volume = load_volume(path, normalise_dtype=np.dtype(np.uint16), as_array=True)
+        # Parent the thread so that it outlives this reference if it is superseded
+        thread = VolumePreprocessorThread(path, unwrap(self.resolution), parent=self)
 
-        # Preprocessing would have been done beforehand
-        volume = gaussian_filter(volume, sigma=5, radius=20)
-        volume = normalise_array(volume, dtype=np.dtype(np.uint8))
-        volume = np.digitize(volume, np.linspace(0, 255, 25)).astype(np.uint8)
-        volume = normalise_array(volume, dtype=np.dtype(np.uint16))
+        thread.started.connect(self.show_volume_status)
+        thread.volume_ready.connect(self.show_volume)
+        thread.finished.connect(self._handle_volume_thread_finished)
+        thread.finished.connect(thread.deleteLater)
 
-        mask_path = get_structure_mask_path(
-            "root", unwrap(self.resolution), ensure_downloaded=True
-        )
-        mask = load_volume(mask_path, as_array=True)
-        volume = np.where(mask, volume, 0)
+        thread.start()
+
+        self._volume_thread = thread
 
-        if isinstance(new_view, VolumeViewer):
-            new_view.set_overlay_volume(volume)
+    @QtCore.Slot()
+    def show_volume(self, volume: np.ndarray) -> None:
+        # Drop results queued by a thread which was superseded after emitting them
+        sender = self.sender()
+        if (
+            isinstance(sender, VolumePreprocessorThread)
+            and sender is not self._volume_thread
+        ):
+            return
+
+        if self._volume_view is None:
+            self._volume_view = VolumeViewer(
+                resolution=self.resolution, overlay_volume=volume
+            )
         else:
-            new_view = VolumeViewer(resolution=self.resolution, overlay_volume=volume)
+            self._volume_view.set_overlay_volume(volume)
 
-        if old_view is not new_view:
-            self.central_view = new_view
-            self.splitter.replaceWidget(1, new_view)
-            old_view.deleteLater()
+        self.set_central_view(self._volume_view)
 
         self.information_widget.structures_widget.setEnabled(False)
 
+    @QtCore.Slot()
+    def show_volume_status(self) -> None:
+        self.clear_volume_status()
+        self._status_bar_label = try_show_permanent_status_message(
+            self.window(), "Preparing volume..."
+        )
+
+    @QtCore.Slot()
+    def clear_volume_status(self) -> None:
+        if self._status_bar_label is not None:
+            self._status_bar_label.deleteLater()
+            self._status_bar_label = None
+
+    @QtCore.Slot()
+    def _handle_volume_thread_finished(self) -> None:
+        """Clears the status of the thread which emitted the signal if it is current."""
+        # A superseded thread finishing must not clear the status of the newer one
+        if self.sender() is not self._volume_thread:
+            return
+
+        self.clear_volume_status()
+        self._volume_thread = None
+
+    def set_central_view(self, view: SliceViewer | VolumeViewer) -> None:
+        """Swaps the central view of the splitter for `view`.
+
+        The previous view is only hidden, not deleted, so that it can be swapped back
+        in later without being rebuilt.
+
+        Args:
+            view (SliceViewer | VolumeViewer): View to place in the centre.
+        """
+        if view is self.central_view:
+            return
+
+        self.splitter.replaceWidget(1, view)
+        self.central_view = view
+
+    @QtCore.Slot()
+    def on_project_opened(self) -> None:
+        self.navigation_widget.setEnabled(True)
+
+    @QtCore.Slot()
+    def on_project_closed(self) -> None:
+        self.navigation_widget.setEnabled(False)
+        self.information_widget.structures_widget.setEnabled(False)
+
+    @QtCore.Slot()
+    def on_image_opened(self) -> None:
+        self.information_widget.structures_widget.setEnabled(True)
+
     @QtCore.Slot()
     def reset(self) -> None:
-        self.central_view.reset()
+        # Drop the results of any preprocessing still running for the closed project
+        if self._volume_thread is not None:
+            self._volume_thread.should_emit = False
+            self._volume_thread = None
+        self.clear_volume_status()
+
+        self.set_central_view(self._slice_view)
+        self._slice_view.reset()
+
+        # The next project might use a different resolution
+        if self._volume_view is not None:
+            self._volume_view.deleteLater()
+            self._volume_view = None
+
         self.navigation_widget.reset()
         self.information_widget.reset()
+
+
+class VolumePreprocessorThread(QtCore.QThread):
+    """Thread class for preparing a volume for display without blocking the GUI.
+
+    Attributes:
+        should_emit (bool): Whether the thread should report its results or drop them.
+                            It should drop them if another volume was requested before
+                            the thread returned.
+
+    Signals:
+        volume_ready (np.ndarray): Emits the preprocessed volume.
+    """
+
+    path: Path
+    resolution: Resolution
+
+    should_emit: bool = True
+
+    volume_ready: QtCore.Signal = QtCore.Signal(np.ndarray)
+
+    def __init__(
+        self,
+        path: Path,
+        resolution: Resolution,
+        parent: Optional[QtCore.QObject] = None,
+    ) -> None:
+        super().__init__(parent)
+
+        self.path = path
+        self.resolution = resolution
+
+    def run(self) -> None:
+        # Preprocessing only depends on the volume file, the resolution and the
+        # pipeline itself so reuse a previous run if none of them changed since.
+        cache_path = _build_preprocessed_volume_path(self.path, self.resolution)
+        volume = None
+        if (
+            cache_path.exists()
+            and cache_path.stat().st_mtime >= self.path.stat().st_mtime
+        ):
+            try:
+                volume = np.load(cache_path, mmap_mode="r")
+            except (OSError, ValueError) as error:
+                _module_logger.warning(
+                    f"Could not load cached preprocessed volume '{cache_path}'. "
+                    f"Preprocessing it again."
+                )
+                _module_logger.debug(error)
+
+        if volume is None:
+            volume = _preprocess_volume(self.path, self.resolution)
+            try:
+                _save_preprocessed_volume(volume, cache_path)
+            except OSError as error:
+                _module_logger.warning(
+                    f"Could not cache preprocessed volume to '{cache_path}'."
+                )
+                _module_logger.debug(error)
+
+        if self.should_emit:
+            self.volume_ready.emit(volume)
+
+
+def _build_preprocessed_volume_path(volume_path: Path, resolution: Resolution) -> Path:
+    # Key on the full name so that volumes only differing by extension don't collide
+    return get_thumbnail_cache_root(volume_path.parent) / (
+        f"{volume_path.name}_preprocessed_8bit_{resolution.value}um"
+        f"_v{_PREPROCESSING_VERSION}.npy"
+    )
+
+
+def _save_preprocessed_volume(volume: np.ndarray, cache_path: Path) -> None:
+    # Write to a temporary file and move it into place so that an interrupted write
+    # never leaves behind a truncated cache newer than the volume.
+    handle = tempfile.NamedTemporaryFile(
+        dir=cache_path.parent, prefix=f"{cache_path.name}.", delete=False
+    )
+    try:
+        with handle:
+            np.save(handle, volume)
+        os.replace(handle.name, cache_path)
+    except BaseException:
+        Path(handle.name).unlink(missing_ok=True)
+        raise
+
+
+def _preprocess_volume(path: Path, resolution: Resolution) -> np.ndarray:
+    # Load (or download) the mask while the volume itself is being read. Both are
+    # mostly IO and decompression which release the GIL.
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        bounding_box_future = executor.submit(
+            _get_root_mask_bounding_box, resolution, _GAUSSIAN_RADIUS
+        )
+        volume = load_volume(path, normalise_dtype=np.dtype(np.uint16), as_array=True)
+
+        # Preprocessing would have been done beforehand
+        # Everything outside the brain is masked out at the end so only process the
+        # part of the volume around the mask.
+        bounding_box = bounding_box_future.result()
+
+    cropped_volume = np.ascontiguousarray(volume[bounding_box])
+
+    _blur_volume(cropped_volume)
+
+    preprocessed_volume = np.zeros(volume.shape, dtype=np.uint8)
+    _quantise_volume(
+        cropped_volume,
+        _get_root_mask(resolution)[bounding_box],
+        out=preprocessed_volume[bounding_box],
+    )
+
+    return preprocessed_volume
+
+
+def _blur_volume(volume: np.ndarray) -> None:
+    """Applies the preprocessing gaussian blur to `volume` in-place.
+
+    The blur is the most expensive step of preprocessing. When CuPy is installed, it is
+    run on the GPU instead, falling back to SciPy if that fails (e.g., no device or not
+    enough device memory).
+
+    Args:
+        volume (np.ndarray): Volume to blur.
+    """
+    sigma = 5
+
+    if cupy is not None:
+        try:
+            # CuPy does not take a radius, express it as a multiple of sigma instead
+            device_volume = cupy_gaussian_filter(
+                cupy.asarray(volume), sigma=sigma, truncate=_GAUSSIAN_RADIUS / sigma
+            )
+            volume[:] = cupy.asnumpy(device_volume)
+            return
+        except Exception as error:
+            _module_logger.debug("Failed to blur volume on the GPU, using the CPU.")
+            _module_logger.debug(error)
+
+    gaussian_filter(volume, sigma=sigma, radius=_GAUSSIAN_RADIUS, output=volume)
+
+
+@lru_cache(maxsize=len(Resolution))
+def _get_root_mask(resolution: Resolution) -> np.ndarray:
+    """Loads the whole-brain mask for `resolution`, keeping it in memory.
+
+    The mask is stored as boolean so that it takes a single byte per voxel and can be
+    applied with an in-place multiplication.
+
+    Args:
+        resolution (Resolution): Resolution of the mask to load.
+
+    Returns:
+        The read-only boolean mask.
+    """
+    mask_path = get_structure_mask_path("root", resolution, ensure_downloaded=True)
+    mask = load_volume(mask_path, as_array=True).astype(bool, copy=False)
+    mask.setflags(write=False)
+
+    return mask
+
+
+@lru_cache(maxsize=len(Resolution))
+def _get_root_mask_bounding_box(
+    resolution: Resolution, margin: int = 0
+) -> tuple[slice, ...]:
+    """Computes the bounding box of the whole-brain mask for `resolution`.
+
+    Args:
+        resolution (Resolution): Resolution of the mask.
+        margin (int, optional): Number of voxels to grow the box by on each side. The
+                                box is clipped to the shape of the mask.
+
+    Returns:
+        The bounding box as a tuple of slices which can index the mask.
+    """
+    mask = _get_root_mask(resolution)
+
+    bounding_box = []
+    for axis in range(mask.ndim):
+        other_axes = tuple(i for i in range(mask.ndim) if i != axis)
+        indices = np.flatnonzero(mask.any(axis=other_axes))
+        if indices.size == 0:
+            return tuple(slice(0, 0) for _ in range(mask.ndim))
+
+        bounding_box.append(
+            slice(
+                max(int(indices[0]) - margin, 0),
+                min(int(indices[-1]) + 1 + margin, mask.shape[axis]),
+            )
+        )
+
+    return tuple(bounding_box)
+
+
+def _quantise_volume(
+    volume: np.ndarray,
+    mask: Optional[np.ndarray] = None,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Quantises a 16-bit volume into 25 uniform levels over the 8-bit range.
+
+    This is equivalent to normalising `volume` to 8-bit and then looking the result up
+    in `_QUANTISATION_TABLE`. However, the normalisation is only computed once per
+    possible value rather than once per voxel, so there is no intermediary float
+    array. The lookup and masking are then done slab by slab along the first axis so
+    that each slab is still in cache when it is masked and written out, making the
+    whole operation a single pass over memory.
+
+    Args:
+        volume (np.ndarray): Volume to quantise. Its dtype should be `np.uint16`.
+        mask (Optional[np.ndarray], optional):
+            Boolean mask of the same shape as `volume`. Voxels outside the mask are set
+            to 0.
+        out (Optional[np.ndarray], optional):
+            8-bit array of the same shape as `volume` to write the result into. A new
+            one is allocated when not provided.
+
+    Returns:
+        The 8-bit quantised volume.
+    """
+    minimum = int(volume.min())
+    maximum = int(volume.max())
+
+    # Same arithmetic as `normalise_array` but only on the range of possible values
+    values = np.arange(minimum, maximum + 1, dtype=np.float64)
+    values -= minimum
+    values /= max(values.max(), 1)
+    values *= 255
+
+    # Index the table directly with the volume values to avoid offsetting the volume
+    table = np.zeros(maximum + 1, dtype=np.uint8)
+    table[minimum:] = _QUANTISATION_TABLE[values.astype(np.uint8)]
+
+    if out is None:
+        out = np.empty(volume.shape, dtype=np.uint8)
+
+    slab_size = max(1, _QUANTISATION_SLAB_BYTES // max(volume[0].nbytes, 1))
+    for start in range(0, volume.shape[0], slab_size):
+        slab = np.s_[start : start + slab_size]
+
+        quantised = table[volume[slab]]
+        if mask is not None:
+            quantised *= mask[slab]
+        out[slab] = quantised
+
+    return out
@@ -4,13 +4,22 @@
 
 from __future__ import annotations
 
+from collections import OrderedDict
 from contextlib import suppress
+from functools import lru_cache
+import hashlib
 import logging
+import os
 from pathlib import Path
+import shutil
+import tempfile
 from typing import Optional
+from zipfile import BadZipFile
 
+import cv2
 import numpy as np
 from PySide6 import QtCore, QtGui, QtWidgets
+from PySide6.QtOpenGLWidgets import QOpenGLWidget
 
 from histalign.backend.ccf import get_atlas_path
 from histalign.backend.maths import normalise_array
@@ -22,6 +31,7 @@ from histalign.frontend.pyside_helpers import (
     try_show_permanent_status_message,
 )
 from histalign.io import (
+    DATA_ROOT,
     load_alignment_settings,
     load_volume,
     open_file,
@@ -31,6 +41,111 @@ from histalign.resources import ICONS_ROOT
 
 _module_logger = logging.getLogger(__name__)
 
+_SLICE_CACHE_SIZE = 64
+
+CONTOURS_CACHE_DIRECTORY = DATA_ROOT / "contours"
+_CONTOURS_CACHE_SIZE = 64
+# Number of alignments whose contours are kept on disk, least recently used first out
+_CONTOURS_DISK_CACHE_SIZE = 256
+# Each thread holds a structure volume in memory so do not run more than there are
+# cores to keep them busy.
+_MAX_CONTOURS_THREADS = os.cpu_count() or 1
+
+
+class ContourPixmapItem(QtWidgets.QGraphicsPixmapItem):
+    """Pixmap item that only paints the part of its pixmap exposed in the view.
+
+    Args:
+        pixmap (QtGui.QPixmap): Pixmap to display.
+        parent (Optional[QtWidgets.QGraphicsItem], optional): Parent of the item.
+    """
+
+    def __init__(
+        self, pixmap: QtGui.QPixmap, parent: Optional[QtWidgets.QGraphicsItem] = None
+    ) -> None:
+        super().__init__(pixmap, parent)
+
+        self.setFlag(
+            QtWidgets.QGraphicsItem.GraphicsItemFlag.ItemUsesExtendedStyleOption, True
+        )
+
+    def paint(
+        self,
+        painter: QtGui.QPainter,
+        option: QtWidgets.QStyleOptionGraphicsItem,
+        widget: Optional[QtWidgets.QWidget] = None,
+    ) -> None:
+        """Paints the exposed part of the item in local coordinates.
+
+        Args:
+            painter (QtGui.QPainter): Painter to use for painting.
+            option (QtWidgets.QStyleOptionGraphicsItem): Options to use for painting.
+            widget (Optional[QtWidgets.QWidget], optional): Widget to paint on.
+        """
+        target = option.exposedRect.intersected(self.boundingRect())
+        if target.isEmpty():
+            return
+
+        painter.drawPixmap(target, self.pixmap(), target.translated(-self.offset()))
+
+
+class ContourImageGeneratorThread(ContourGeneratorThread):
+    """Contour generator thread which also rasterises the contours it generates.
+
+    Rasterising in the worker keeps the pixel work off the GUI thread, which only has
+    to upload the finished image. The contours are also written to the disk cache from
+    the worker for the same reason.
+
+    Signals:
+        image_ready (QtGui.QImage, tuple[int, int]): Emits the rasterised contours and
+                                                     the XY position of the image's top
+                                                     left corner on the histology.
+    """
+
+    image_shape: tuple[int, int]
+    thickness: int
+    cache_path: Optional[Path]
+
+    image_ready: QtCore.Signal = QtCore.Signal(QtGui.QImage, tuple)
+
+    def __init__(
+        self,
+        structure_name: str,
+        alignment_settings: AlignmentSettings,
+        image_shape: tuple[int, int],
+        thickness: int,
+        cache_path: Optional[Path] = None,
+        parent: Optional[QtCore.QObject] = None,
+    ) -> None:
+        super().__init__(structure_name, alignment_settings, parent)
+
+        self.image_shape = image_shape
+        self.thickness = thickness
+        self.cache_path = cache_path
+
+        # Direct connections so the slots run in the worker thread emitting the signal.
+        # Rasterise first so that writing the cache does not delay the image.
+        self.contours_ready.connect(
+            self.rasterise_contours, QtCore.Qt.ConnectionType.DirectConnection
+        )
+        self.contours_ready.connect(
+            self.save_contours, QtCore.Qt.ConnectionType.DirectConnection
+        )
+
+    @QtCore.Slot()
+    def rasterise_contours(self, contours: list[np.ndarray]) -> None:
+        image, top_left = _contours_to_image(
+            contours, self.image_shape, self.thickness
+        )
+
+        if self.should_emit:
+            self.image_ready.emit(image, top_left)
+
+    @QtCore.Slot()
+    def save_contours(self, contours: list[np.ndarray]) -> None:
+        if self.cache_path is not None:
+            _write_contours_cache(self.cache_path, contours)
+
 
 class SliceViewer(QtWidgets.QWidget):
     def __init__(self, parent: Optional[QtWidgets.QWidget] = None) -> None:
@@ -42,6 +157,14 @@ class SliceViewer(QtWidgets.QWidget):
 
         self._contours: dict[str, QtWidgets.QGraphicsPixmapItem] = {}
         self._contours_threads: dict[str, ContourGeneratorThread] = {}
+        self._pending_contours: OrderedDict[str, tuple[str, str]] = OrderedDict()
+        self._running_contours_threads_count: int = 0
+        self._deferred_contours: dict[str, tuple[QtGui.QImage, tuple[int, int]]] = {}
+        self._batch_depth: int = 0
+        self._alignment_hash: str = ""
+        self._contours_cache: OrderedDict[tuple[str, str], list[np.ndarray]] = (
+            OrderedDict()
+        )
 
         self._processing_count: int = 0
         self._status_bar_label: Optional[QtWidgets.QLabel] = None
@@ -57,6 +180,20 @@ class SliceViewer(QtWidgets.QWidget):
         view.setBackgroundBrush(QtCore.Qt.GlobalColor.black)
         view.setContentsMargins(0, 0, 0, 0)
 
+        # Composite the histology and contour pixmaps on the GPU when possible. Partial
+        # updates do not save anything with an OpenGL viewport so always redraw the
+        # whole view.
+        if _is_opengl_available():
+            viewport = QOpenGLWidget()
+            surface_format = QtGui.QSurfaceFormat()
+            surface_format.setSwapInterval(1)
+            viewport.setFormat(surface_format)
+
+            view.setViewport(viewport)
+            view.setViewportUpdateMode(
+                QtWidgets.QGraphicsView.ViewportUpdateMode.FullViewportUpdate
+            )
+
         self.view = view
 
         #
@@ -69,8 +206,37 @@ class SliceViewer(QtWidgets.QWidget):
         self.setLayout(layout)
 
     def clear_contours(self) -> None:
-        for structure in list(self._contours.keys()):
+        structures = {*self._contours, *self._contours_threads, *self._pending_contours}
+
+        self.begin_batch()
+        for structure in structures:
             self.remove_contours(structure)
+        self.end_batch()
+
+    def begin_batch(self) -> None:
+        """Starts deferring contour changes until `end_batch` is called.
+
+        Contours added while batching are only added to the scene once the outermost
+        batch ends and the view is only repainted once. Calls can be nested.
+        """
+        if self._batch_depth == 0:
+            self.view.viewport().setUpdatesEnabled(False)
+        self._batch_depth += 1
+
+    def end_batch(self) -> None:
+        """Ends a batch started with `begin_batch`, applying the deferred changes."""
+        self._batch_depth = max(self._batch_depth - 1, 0)
+        if self._batch_depth > 0:
+            return
+
+        deferred_contours = self._deferred_contours
+        self._deferred_contours = {}
+        for structure, (image, top_left) in deferred_contours.items():
+            self.add_contours_image(structure, image, top_left)
+
+        viewport = self.view.viewport()
+        viewport.setUpdatesEnabled(True)
+        viewport.update()
 
     def reset(self) -> None:
         self.clear_contours()
@@ -80,8 +246,9 @@ class SliceViewer(QtWidgets.QWidget):
         if self._histology_item is not None:
             self.scene.removeItem(self._histology_item)
 
-        pixmap_item = self.scene.addPixmap(pixmap)
+        pixmap_item = ContourPixmapItem(pixmap)
         pixmap_item.setZValue(-1)
+        self.scene.addItem(pixmap_item)
 
         self.view.set_focus_rect(pixmap_item.sceneBoundingRect())
         self._histology_item = pixmap_item
@@ -106,13 +273,19 @@ class SliceViewer(QtWidgets.QWidget):
         histology_path = alignment_settings.histology_path
 
         handle = open_file(unwrap(histology_path))
-        image = normalise_array(handle.read_image(handle.index), np.dtype(np.uint8))
+        image = handle.read_image(handle.index)
         if "XY" in handle.dimension_order.value:
             image = image.T
+        # Normalising after transposing gives a C-contiguous array which the pixmap can
+        # be created from without another copy.
+        image = normalise_array(image, np.dtype(np.uint8))
         pixmap = np_to_qpixmap(image)
 
         self.set_pixmap(pixmap)
         self._alignment_settings = alignment_settings
+        self._alignment_hash = hashlib.blake2b(
+            alignment_settings.model_dump_json().encode(), digest_size=8
+        ).hexdigest()
 
         self.clear_contours()
 
@@ -121,59 +294,173 @@ class SliceViewer(QtWidgets.QWidget):
         if self._alignment_settings is None:
             return
 
-        thread = ContourGeneratorThread(structure, self._alignment_settings)
+        key = (self._alignment_hash, structure)
+        contours = self._get_cached_contours(key)
+        if contours is not None:
+            self.add_contours(structure, contours)
+            return
+
+        # Queue the structure rather than starting a thread straight away so that
+        # toggling many structures at once does not oversubscribe the CPU.
+        if structure not in self._pending_contours:
+            self.increment_processing_count()
+        self._pending_contours[structure] = key
+
+        self._start_pending_contours_threads()
+
+    def _start_pending_contours_threads(self) -> None:
+        while (
+            self._pending_contours
+            and self._running_contours_threads_count < _MAX_CONTOURS_THREADS
+        ):
+            structure, key = self._pending_contours.popitem(last=False)
+
+            thread = ContourImageGeneratorThread(
+                structure,
+                unwrap(self._alignment_settings),
+                self._get_histology_shape(),
+                self._get_contours_thickness(),
+                cache_path=_build_contours_cache_path(key),
+            )
 
-        thread.started.connect(self.increment_processing_count)
-        thread.contours_ready.connect(lambda x: self.add_contours(structure, x))
-        thread.finished.connect(self.decrement_processing_count)
-        thread.finished.connect(thread.deleteLater)
+            thread.contours_ready.connect(lambda x, k=key: self._cache_contours(k, x))
+            thread.image_ready.connect(
+                lambda x, y, s=structure: self._add_contours_coalesced(s, x, y)
+            )
+            thread.finished.connect(self._handle_contours_thread_finished)
+            thread.finished.connect(self.decrement_processing_count)
+            thread.finished.connect(thread.deleteLater)
 
-        thread.start()
+            self._contours_threads[structure] = thread
+            self._running_contours_threads_count += 1
 
-        self._contours_threads[structure] = thread
+            thread.start()
+
+    @QtCore.Slot()
+    def _handle_contours_thread_finished(self) -> None:
+        """Frees the slot of the thread which emitted the signal and starts the next."""
+        thread = self.sender()
+        self._running_contours_threads_count -= 1
+
+        # A newer thread might have been started for the same structure if this one was
+        # cancelled and the structure requested again.
+        structure = thread.structure_name
+        if self._contours_threads.get(structure) is thread:
+            del self._contours_threads[structure]
+
+        self._start_pending_contours_threads()
+
+    def _add_contours_coalesced(
+        self, structure: str, image: QtGui.QImage, top_left: tuple[int, int]
+    ) -> None:
+        """Adds rasterised contours on the next event loop iteration.
+
+        Threads finishing close together then only cause a single repaint.
+
+        Args:
+            structure (str): Name of the structure the contours belong to.
+            image (QtGui.QImage): Rasterised contours.
+            top_left (tuple[int, int]): XY position of the image on the histology.
+        """
+        self.begin_batch()
+        self.add_contours_image(structure, image, top_left)
+        QtCore.QTimer.singleShot(0, self.end_batch)
 
     @QtCore.Slot()
     def add_contours(self, structure: str, contours: list[np.ndarray]) -> None:
         if self._histology_item is None:
             return
 
-        image = QtGui.QImage(
-            self._histology_item.pixmap().size(),
-            QtGui.QImage.Format.Format_ARGB32,
+        image, top_left = _contours_to_image(
+            contours, self._get_histology_shape(), self._get_contours_thickness()
         )
-        image.fill(0)
+        self.add_contours_image(structure, image, top_left)
 
-        pixmap = QtGui.QPixmap(image)
+    @QtCore.Slot()
+    def add_contours_image(
+        self, structure: str, image: QtGui.QImage, top_left: tuple[int, int]
+    ) -> None:
+        if self._batch_depth > 0:
+            self._deferred_contours[structure] = (image, top_left)
+            return
 
-        painter = QtGui.QPainter(pixmap)
+        if self._histology_item is None:
+            return
 
-        width = 1.0
-        width *= 100 / unwrap(self._alignment_settings).volume_settings.resolution.value
-        painter.setPen(QtGui.QPen(QtCore.Qt.GlobalColor.white, width))
+        item = ContourPixmapItem(QtGui.QPixmap.fromImage(image))
+        item.setPos(*top_left)
+        self.scene.addItem(item)
+
+        self._contours[structure] = item
 
-        for contour in contours:
-            for i in range(contour.shape[0]):
-                p1 = QtCore.QPoint(*contour[i, 0].tolist())
-                j = i + 1
-                if i == contour.shape[0] - 1:
-                    j = 0
-                p2 = QtCore.QPoint(*contour[j, 0].tolist())
+    def _get_histology_shape(self) -> tuple[int, int]:
+        if self._histology_item is None:
+            return 0, 0
 
-                painter.drawLine(p1, p2)
+        size = self._histology_item.pixmap().size()
+        return size.height(), size.width()
 
-        painter.end()
+    def _get_contours_thickness(self) -> int:
+        width = 1.0
+        width *= 100 / unwrap(self._alignment_settings).volume_settings.resolution.value
 
-        self._contours[structure] = self.scene.addPixmap(pixmap)
+        return max(round(width), 1)
 
     @QtCore.Slot()
     def remove_contours(self, structure: str) -> None:
         with suppress(KeyError):
             self._contours_threads[structure].should_emit = False
+        if self._pending_contours.pop(structure, None) is not None:
+            self.decrement_processing_count()
+        self._deferred_contours.pop(structure, None)
 
         item = self._contours.pop(structure, None)
         if item is not None:
             self.scene.removeItem(item)
 
+    def _get_cached_contours(
+        self, key: tuple[str, str]
+    ) -> Optional[list[np.ndarray]]:
+        """Retrieves previously generated contours from memory or disk.
+
+        Args:
+            key (tuple[str, str]): Hash of the alignment settings and structure name.
+
+        Returns:
+            The cached contours if they exist, `None` otherwise.
+        """
+        contours = self._contours_cache.get(key)
+        if contours is not None:
+            self._contours_cache.move_to_end(key)
+            return contours
+
+        path = _build_contours_cache_path(key)
+        try:
+            with np.load(path) as archive:
+                contours = [archive[name] for name in archive.files]
+        except (BadZipFile, EOFError, OSError, ValueError):
+            return None
+
+        # Mark the alignment as recently used for pruning
+        with suppress(OSError):
+            os.utime(path.parent)
+
+        self._cache_contours(key, contours)
+        return contours
+
+    def _cache_contours(self, key: tuple[str, str], contours: list[np.ndarray]) -> None:
+        """Caches generated contours in memory.
+
+        Writing them to disk is left to the thread which generated them.
+
+        Args:
+            key (tuple[str, str]): Hash of the alignment settings and structure name.
+            contours (list[np.ndarray]): Contours to cache.
+        """
+        self._contours_cache[key] = contours
+        if len(self._contours_cache) > _CONTOURS_CACHE_SIZE:
+            self._contours_cache.popitem(last=False)
+
     @QtCore.Slot()
     def increment_processing_count(self) -> None:
         self._processing_count += 1
@@ -209,6 +496,8 @@ class VolumeViewer(QtWidgets.QWidget):
         self._sagittal_pixmap_item: Optional[QtWidgets.QGraphicsPixmapItem] = None
 
         self._slicing_indices = np.array([0, 0, 0])
+        self._slice_cache: OrderedDict[tuple[int, int], np.ndarray] = OrderedDict()
+        self._layout_size = QtCore.QSize()
 
         #
         self.setContentsMargins(0, 0, 0, 0)
@@ -236,36 +525,32 @@ class VolumeViewer(QtWidgets.QWidget):
         #
         coronal_view = FMRIPreview(master_scene, self)
 
-        coronal_view.make_primary_requested.connect(
-            lambda: self.make_primary(coronal_view)
-        )
-        coronal_view.up_scrolled.connect(lambda: self.increment_slicing_index(0))
-        coronal_view.down_scrolled.connect(lambda: self.decrement_slicing_index(0))
+        coronal_view.make_primary_requested.connect(self._make_sender_primary)
+        coronal_view.up_scrolled.connect(self._increment_sender_slicing_index)
+        coronal_view.down_scrolled.connect(self._decrement_sender_slicing_index)
 
         self.coronal_view = coronal_view
 
         #
         horizontal_view = FMRIPreview(master_scene, self)
 
-        horizontal_view.make_primary_requested.connect(
-            lambda: self.make_primary(horizontal_view)
-        )
-        horizontal_view.up_scrolled.connect(lambda: self.increment_slicing_index(1))
-        horizontal_view.down_scrolled.connect(lambda: self.decrement_slicing_index(1))
+        horizontal_view.make_primary_requested.connect(self._make_sender_primary)
+        horizontal_view.up_scrolled.connect(self._increment_sender_slicing_index)
+        horizontal_view.down_scrolled.connect(self._decrement_sender_slicing_index)
 
         self.horizontal_view = horizontal_view
 
         #
         sagittal_view = FMRIPreview(master_scene, self)
 
-        sagittal_view.make_primary_requested.connect(
-            lambda: self.make_primary(sagittal_view)
-        )
-        sagittal_view.up_scrolled.connect(lambda: self.increment_slicing_index(2))
-        sagittal_view.down_scrolled.connect(lambda: self.decrement_slicing_index(2))
+        sagittal_view.make_primary_requested.connect(self._make_sender_primary)
+        sagittal_view.up_scrolled.connect(self._increment_sender_slicing_index)
+        sagittal_view.down_scrolled.connect(self._decrement_sender_slicing_index)
 
         self.sagittal_view = sagittal_view
 
+        self._views = (coronal_view, horizontal_view, sagittal_view)
+
         #
         if reference_volume is None:
             if resolution is None:
@@ -274,30 +559,44 @@ class VolumeViewer(QtWidgets.QWidget):
                     "or a resolution."
                 )
 
-            path = get_atlas_path(resolution, ensure_downloaded=True)
-            reference_volume = load_volume(
-                path, normalise_dtype=np.dtype(np.uint16), as_array=True
-            )
+            reference_volume = _load_atlas_volume(resolution)
 
+        # Setting the reference volume renders all the views, so only do it once
         self.overlay_volume = overlay_volume
         self.set_reference_volume(reference_volume)
-        self.update_views()
 
     def minimumSize(self) -> QtCore.QSize:
         return QtCore.QSize(200, 150)
 
     def reset(self) -> None:
-        self.set_reference_volume(np.zeros((1, 1, 1), dtype=np.uint8))
-        self.set_overlay_volume(np.zeros((1, 1, 1), dtype=np.uint8))
-
-    def set_reference_volume(self, volume: np.ndarray) -> None:
+        # Use `None` as a sentinel rather than allocating placeholder volumes
+        self.set_reference_volume(None)
+        self.set_overlay_volume(None)
+
+        for item in (
+            self._coronal_pixmap_item,
+            self._horizontal_pixmap_item,
+            self._sagittal_pixmap_item,
+        ):
+            if item is not None:
+                item.setPixmap(QtGui.QPixmap())
+
+    def set_reference_volume(self, volume: Optional[np.ndarray]) -> None:
         self.reference_volume = volume
-        self._slicing_indices = (np.array(volume.shape) - 1) // 2
+        self._slice_cache.clear()
         if volume is not None:
+            self._slicing_indices = (np.array(volume.shape) - 1) // 2
             self.update_views()
 
-    def set_overlay_volume(self, volume: np.ndarray) -> None:
+    def set_overlay_volume(self, volume: Optional[np.ndarray]) -> None:
+        if volume is not None and volume.dtype == np.uint16:
+            # Slices are displayed as 8-bit so only keep the overlay at that depth.
+            # This halves its memory footprint and avoids every composited slice
+            # upcasting through `np.where`.
+            volume = (volume >> 8).astype(np.uint8)
+
         self.overlay_volume = volume
+        self._slice_cache.clear()
         if volume is not None:
             self.update_views()
 
@@ -312,20 +611,11 @@ class VolumeViewer(QtWidgets.QWidget):
 
         new_index = self._slicing_indices[view_index] + 1
         if new_index >= self.reference_volume.shape[view_index]:
-            new_index -= 1
+            return
 
         self._slicing_indices[view_index] = new_index
 
-        if view_index == 0:
-            view = self.coronal_view
-        elif view_index == 1:
-            view = self.horizontal_view
-        elif view_index == 2:
-            view = self.sagittal_view
-        else:
-            return
-
-        self._update_view(view)
+        self._update_view(self._views[view_index])
 
     def decrement_slicing_index(self, view_index: int) -> None:
         if self.reference_volume is None:
@@ -333,20 +623,26 @@ class VolumeViewer(QtWidgets.QWidget):
 
         new_index = self._slicing_indices[view_index] - 1
         if new_index < 0:
-            new_index += 1
+            return
 
         self._slicing_indices[view_index] = new_index
 
-        if view_index == 0:
-            view = self.coronal_view
-        elif view_index == 1:
-            view = self.horizontal_view
-        elif view_index == 2:
-            view = self.sagittal_view
-        else:
-            return
+        self._update_view(self._views[view_index])
+
+    @QtCore.Slot()
+    def _make_sender_primary(self) -> None:
+        """Makes the preview which emitted the triggering signal the primary view."""
+        self.make_primary(self.sender())
 
-        self._update_view(view)
+    @QtCore.Slot()
+    def _increment_sender_slicing_index(self) -> None:
+        """Increments the slicing index of the preview which emitted the signal."""
+        self.increment_slicing_index(self._views.index(self.sender()))
+
+    @QtCore.Slot()
+    def _decrement_sender_slicing_index(self) -> None:
+        """Decrements the slicing index of the preview which emitted the signal."""
+        self.decrement_slicing_index(self._views.index(self.sender()))
 
     def update_views(self) -> None:
         if self.reference_volume is None:
@@ -362,24 +658,14 @@ class VolumeViewer(QtWidgets.QWidget):
 
         if view == self.coronal_view:
             index = 0
-            slicing = self._slicing_indices[index]
         elif view == self.horizontal_view:
             index = 1
-            slicing = (slice(None), self._slicing_indices[index])
         elif view == self.sagittal_view:
             index = 2
-            slicing = (slice(None), slice(None), self._slicing_indices[index])
         else:
             return
 
-        array = self.reference_volume[slicing]
-        if self.overlay_volume is not None:
-            overlay = self.overlay_volume[slicing]
-            array = np.where(overlay, overlay, array)
-
-            if view == self.sagittal_view:
-                array = array.T
-        pixmap = np_to_qpixmap(array)
+        pixmap = np_to_qpixmap(self._get_slice(index))
 
         if view == self.coronal_view:
             self.set_coronal_pixmap(pixmap)
@@ -388,7 +674,51 @@ class VolumeViewer(QtWidgets.QWidget):
         elif view == self.sagittal_view:
             self.set_sagittal_pixmap(pixmap)
 
+    def _get_slice(self, view_index: int) -> np.ndarray:
+        """Returns the composited slice for a view at its current slicing index.
+
+        Recently computed slices are kept in a small LRU cache which is invalidated
+        whenever either volume changes.
+
+        Args:
+            view_index (int): Index of the view (0: coronal, 1: horizontal, 2:
+                              sagittal).
+
+        Returns:
+            The 2D slice, with the overlay applied if one is set. 16-bit slices are
+            returned as 8-bit.
+        """
+        key = (view_index, int(self._slicing_indices[view_index]))
+        array = self._slice_cache.get(key)
+        if array is not None:
+            self._slice_cache.move_to_end(key)
+            return array
+
+        slicing = (slice(None),) * view_index + (self._slicing_indices[view_index],)
+
+        array = unwrap(self.reference_volume)[slicing]
+        if array.dtype == np.uint16:
+            # There is no need for the extra precision on screen. Displaying as 8-bit
+            # halves the bytes copied into the QImage and converted by Qt.
+            array = (array >> 8).astype(np.uint8)
+
+        if self.overlay_volume is not None:
+            overlay = self.overlay_volume[slicing]
+            array = np.where(overlay, overlay, array)
+
+            if view_index == 2:
+                array = array.T
+
+        self._slice_cache[key] = array
+        if len(self._slice_cache) > _SLICE_CACHE_SIZE:
+            self._slice_cache.popitem(last=False)
+
+        return array
+
     def set_coronal_pixmap(self, pixmap: QtGui.QPixmap) -> None:
+        if self._update_pixmap_in_place(pixmap, self._coronal_pixmap_item):
+            return
+
         self._coronal_pixmap_item = self._replace_pixmap_item(
             pixmap, self._coronal_pixmap_item
         )
@@ -402,6 +732,9 @@ class VolumeViewer(QtWidgets.QWidget):
             self.make_primary(self.coronal_view)
 
     def set_horizontal_pixmap(self, pixmap: QtGui.QPixmap) -> None:
+        if self._update_pixmap_in_place(pixmap, self._horizontal_pixmap_item):
+            return
+
         self._horizontal_pixmap_item = self._replace_pixmap_item(
             pixmap, self._horizontal_pixmap_item
         )
@@ -415,6 +748,9 @@ class VolumeViewer(QtWidgets.QWidget):
             self.make_primary(self.horizontal_view)
 
     def set_sagittal_pixmap(self, pixmap: QtGui.QPixmap) -> None:
+        if self._update_pixmap_in_place(pixmap, self._sagittal_pixmap_item):
+            return
+
         self._sagittal_pixmap_item = self._replace_pixmap_item(
             pixmap, self._sagittal_pixmap_item
         )
@@ -441,8 +777,13 @@ class VolumeViewer(QtWidgets.QWidget):
         self._primary_view = view
 
     def _do_layout(self) -> None:
-        width = self.contentsRect().width()
-        height = self.contentsRect().height()
+        size = self.contentsRect().size()
+        if size == self._layout_size:
+            return
+        self._layout_size = size
+
+        width = size.width()
+        height = size.height()
         side_dimension = height // 3
 
         self.primary_view.setGeometry(
@@ -470,6 +811,30 @@ class VolumeViewer(QtWidgets.QWidget):
             side_dimension,
         )
 
+    @staticmethod
+    def _update_pixmap_in_place(
+        pixmap: QtGui.QPixmap,
+        pixmap_item: QtWidgets.QGraphicsPixmapItem | None = None,
+    ) -> bool:
+        """Swaps the pixmap of an existing item when its size has not changed.
+
+        When the size is unchanged, the item's geometry is the same and so the focus
+        rectangles and zoom levels of the views do not need to be recomputed.
+
+        Args:
+            pixmap (QtGui.QPixmap): New pixmap to display.
+            pixmap_item (QtWidgets.QGraphicsPixmapItem | None, optional):
+                Item currently displaying the previous pixmap.
+
+        Returns:
+            Whether the pixmap could be updated in place.
+        """
+        if pixmap_item is None or pixmap_item.pixmap().size() != pixmap.size():
+            return False
+
+        pixmap_item.setPixmap(pixmap)
+        return True
+
     def _replace_pixmap_item(
         self,
         pixmap: QtGui.QPixmap,
@@ -483,6 +848,184 @@ class VolumeViewer(QtWidgets.QWidget):
         return pixmap_item
 
 
+@lru_cache(maxsize=1)
+def _is_opengl_available() -> bool:
+    """Returns whether an OpenGL context can be created on the current platform."""
+    return QtGui.QOpenGLContext().create()
+
+
+def _build_contours_cache_path(key: tuple[str, str]) -> Path:
+    alignment_hash, structure = key
+    return CONTOURS_CACHE_DIRECTORY / alignment_hash / f"{structure}.npz"
+
+
+def _write_contours_cache(path: Path, contours: list[np.ndarray]) -> None:
+    """Writes contours to the disk cache, pruning it when adding a new alignment.
+
+    Failures are only logged since the cache is an optimisation.
+
+    Args:
+        path (Path): Path to save the contours to.
+        contours (list[np.ndarray]): Contours to save.
+    """
+    try:
+        is_new_alignment = not path.parent.exists()
+        os.makedirs(path.parent, exist_ok=True)
+        _save_contours(path, contours)
+    except OSError as error:
+        _module_logger.debug(f"Failed to cache contours to '{path}'.")
+        _module_logger.debug(error)
+        return
+
+    if is_new_alignment:
+        _prune_contours_cache()
+
+
+def _save_contours(path: Path, contours: list[np.ndarray]) -> None:
+    """Saves contours to disk without ever leaving a partially written archive.
+
+    Args:
+        path (Path): Path to save the contours to.
+        contours (list[np.ndarray]): Contours to save.
+    """
+    handle = tempfile.NamedTemporaryFile(
+        dir=path.parent, prefix=f"{path.name}.", delete=False
+    )
+    try:
+        with handle:
+            # Positional arrays keep the contours' order
+            np.savez(handle, *contours)
+        os.replace(handle.name, path)
+    except BaseException:
+        Path(handle.name).unlink(missing_ok=True)
+        raise
+
+
+def _prune_contours_cache() -> None:
+    """Removes the least recently used alignments from the contours disk cache."""
+    try:
+        directories = [
+            entry for entry in os.scandir(CONTOURS_CACHE_DIRECTORY) if entry.is_dir()
+        ]
+        directories.sort(key=lambda entry: entry.stat().st_mtime)
+    except OSError as error:
+        _module_logger.debug("Failed to list the contours cache for pruning.")
+        _module_logger.debug(error)
+        return
+
+    for entry in directories[: max(len(directories) - _CONTOURS_DISK_CACHE_SIZE, 0)]:
+        shutil.rmtree(entry.path, ignore_errors=True)
+
+
+def _rasterise_contours(
+    contours: list[np.ndarray], shape: tuple[int, int], thickness: int
+) -> tuple[np.ndarray, tuple[int, int]]:
+    """Draws closed contours onto a mask only as large as their bounding box.
+
+    Args:
+        contours (list[np.ndarray]): Contours to draw, in the format returned by
+                                     `cv2.findContours`.
+        shape (tuple[int, int]): Shape of the image the contours are drawn over. The
+                                 bounding box is clipped to it.
+        thickness (int): Thickness of the lines in pixels.
+
+    Returns:
+        The 8-bit mask with the contour lines set to 255 and the XY position of its top
+        left corner in the image.
+    """
+    if not contours:
+        return np.zeros((0, 0), dtype=np.uint8), (0, 0)
+
+    points = np.concatenate(contours, axis=0).reshape(-1, 2)
+    margin = thickness // 2 + 1
+
+    x_min, y_min = np.maximum(points.min(axis=0) - margin, 0)
+    x_max, y_max = np.minimum(points.max(axis=0) + margin + 1, shape[::-1])
+    if x_max <= x_min or y_max <= y_min:
+        return np.zeros((0, 0), dtype=np.uint8), (0, 0)
+
+    mask = np.zeros((y_max - y_min, x_max - x_min), dtype=np.uint8)
+    offset = np.array([x_min, y_min])
+    cv2.polylines(
+        mask,
+        [contour - offset.astype(contour.dtype) for contour in contours],
+        isClosed=True,
+        color=255,
+        thickness=thickness,
+    )
+
+    return mask, (int(x_min), int(y_min))
+
+
+def _contours_to_image(
+    contours: list[np.ndarray], shape: tuple[int, int], thickness: int
+) -> tuple[QtGui.QImage, tuple[int, int]]:
+    """Rasterises closed contours into a white, premultiplied ARGB image.
+
+    Unlike pixmaps, images can safely be created outside of the GUI thread.
+
+    Args:
+        contours (list[np.ndarray]): Contours to draw, in the format returned by
+                                     `cv2.findContours`.
+        shape (tuple[int, int]): Shape of the image the contours are drawn over.
+        thickness (int): Thickness of the lines in pixels.
+
+    Returns:
+        The image of the contours' bounding box and the XY position of its top left
+        corner in the image the contours are drawn over.
+    """
+    mask, top_left = _rasterise_contours(contours, shape, thickness)
+
+    image = QtGui.QImage(
+        mask.shape[1], mask.shape[0], QtGui.QImage.Format.Format_ARGB32_Premultiplied
+    )
+    if image.isNull():
+        return image, top_left
+
+    # Premultiplied white with the mask as alpha, i.e., the mask in every channel.
+    # Write straight into the image's buffer to avoid an intermediate array.
+    pixels = np.ndarray(
+        (image.height(), image.bytesPerLine() // 4),
+        dtype=np.uint32,
+        buffer=image.bits(),
+    )
+    np.multiply(mask, np.uint32(0x01010101), out=pixels[:, : image.width()])
+
+    return image, top_left
+
+
+@lru_cache(maxsize=1)
+def _get_search_icon(colour: int) -> QtGui.QIcon:
+    """Returns the search icon shared by all previews.
+
+    Args:
+        colour (int): RGBA window colour the icon is tinted for. Keying on it rebuilds
+                      the icon when the theme changes.
+
+    Returns:
+        The search icon.
+    """
+    return QtGui.QIcon(BinaryAlphaPixmap(ICONS_ROOT / "search-line-icon.png"))
+
+
+@lru_cache(maxsize=1)
+def _load_atlas_volume(resolution: Resolution) -> np.ndarray:
+    """Loads the atlas volume for `resolution`, keeping the last one in memory.
+
+    A new `VolumeViewer` is created each time the user switches from viewing images
+    back to viewing volumes. Caching avoids re-reading the atlas from disk each time.
+    The returned array is shared and should not be modified in-place.
+
+    Args:
+        resolution (Resolution): Resolution of the atlas to load.
+
+    Returns:
+        The atlas volume normalised to 16-bit.
+    """
+    path = get_atlas_path(resolution, ensure_downloaded=True)
+    return load_volume(path, normalise_dtype=np.dtype(np.uint16), as_array=True)
+
+
 class FMRIPreview(ZoomAndPanView):
     make_primary_requested: QtCore.Signal = QtCore.Signal()
     up_scrolled: QtCore.Signal = QtCore.Signal()
@@ -506,7 +1049,9 @@ class FMRIPreview(ZoomAndPanView):
         make_primary_button = QtWidgets.QPushButton(self)
 
         make_primary_button.setIcon(
-            BinaryAlphaPixmap(ICONS_ROOT / "search-line-icon.png")
+            _get_search_icon(
+                QtWidgets.QApplication.instance().palette().window().color().rgba()
+            )
         )
         make_primary_button.setIconSize(QtCore.QSize(12, 12))
 
@@ -4,7 +4,9 @@
 
 from __future__ import annotations
 
+from collections import deque
 import logging
+import os
 from pathlib import Path
 from typing import Optional
 
@@ -26,13 +28,16 @@ from histalign.frontend.common_widgets import (
     ProjectDirectoriesComboBox,
     TitleFrame,
 )
-from histalign.frontend.pyside_helpers import lua_aware_shift
+from histalign.frontend.pyside_helpers import get_inner_margins, lua_aware_shift
 from histalign.frontend.quantification.prepare import ChannelFrame, ZStackFrame
 from histalign.language_helpers import unwrap
 from histalign.resources import ICONS_ROOT
 
 _module_logger = logging.getLogger(__name__)
 
+# Building and interpolating are memory hungry so only use half the cores
+_MAX_CONCURRENT_JOBS = max(1, (os.cpu_count() or 1) // 2)
+
 
 class VolumeBuilderWidget(QtWidgets.QWidget):
     project_root: Optional[Path]
@@ -47,7 +52,8 @@ class VolumeBuilderWidget(QtWidgets.QWidget):
     progress_bar: QtWidgets.QProgressBar
 
     _jobs_map: dict[JobWidget, VolumeBuildingSettings]
-    _jobs_thread: Optional[QtCore.QThread]
+    _queued_jobs: deque[tuple[JobWidget, VolumeBuildingSettings]]
+    _running_jobs_count: int
     _progress: int
 
     project_opened: QtCore.Signal = QtCore.Signal()
@@ -63,7 +69,8 @@ class VolumeBuilderWidget(QtWidgets.QWidget):
         self.running = False
 
         self._jobs_map = {}
-        self._jobs_thread = None
+        self._queued_jobs = deque()
+        self._running_jobs_count = 0
         self._progress = 0
 
         # Create left column
@@ -91,24 +98,16 @@ class VolumeBuilderWidget(QtWidgets.QWidget):
         )
         self.parameters_frame = parameters_frame
 
+        parameters_frame_margins = get_inner_margins(parameters_frame)
+
         add_job_button = QtWidgets.QPushButton("Add job")
         add_job_button.clicked.connect(self.queue_job)
-        add_job_button.setContentsMargins(
-            parameters_frame.contentsMargins().left() - parameters_frame.frameWidth(),
-            0,
-            parameters_frame.contentsMargins().right() - parameters_frame.frameWidth(),
-            parameters_frame.contentsMargins().bottom() - parameters_frame.frameWidth(),
-        )
+        add_job_button.setContentsMargins(parameters_frame_margins)
         self.add_job_button = add_job_button
 
         add_job_button_layout = QtWidgets.QHBoxLayout()
         add_job_button_layout.addWidget(add_job_button)
-        add_job_button_layout.setContentsMargins(
-            parameters_frame.contentsMargins().left() - parameters_frame.frameWidth(),
-            0,
-            parameters_frame.contentsMargins().right() - parameters_frame.frameWidth(),
-            parameters_frame.contentsMargins().bottom() - parameters_frame.frameWidth(),
-        )
+        add_job_button_layout.setContentsMargins(parameters_frame_margins)
 
         parameters_layout = QtWidgets.QVBoxLayout()
         parameters_layout.addWidget(parameters_frame)
@@ -141,14 +140,11 @@ class VolumeBuilderWidget(QtWidgets.QWidget):
         run_jobs_button.setContentsMargins(0, 0, 0, 0)
         self.run_jobs_button = run_jobs_button
 
+        jobs_frame_margins = get_inner_margins(jobs_frame)
+
         button_layout = QtWidgets.QHBoxLayout()
         button_layout.addWidget(run_jobs_button)
-        button_layout.setContentsMargins(
-            jobs_frame.contentsMargins().left() - jobs_frame.frameWidth(),
-            0,
-            jobs_frame.contentsMargins().right() - jobs_frame.frameWidth(),
-            jobs_frame.contentsMargins().bottom() - jobs_frame.frameWidth(),
-        )
+        button_layout.setContentsMargins(jobs_frame_margins)
 
         jobs_layout = QtWidgets.QVBoxLayout()
         jobs_layout.addWidget(jobs_frame)
@@ -169,12 +165,7 @@ class VolumeBuilderWidget(QtWidgets.QWidget):
 
         progress_bar_layout = QtWidgets.QHBoxLayout()
         progress_bar_layout.addWidget(progress_bar)
-        progress_bar_layout.setContentsMargins(
-            jobs_frame.contentsMargins().left() - jobs_frame.frameWidth(),
-            0,
-            jobs_frame.contentsMargins().right() - jobs_frame.frameWidth(),
-            jobs_frame.contentsMargins().bottom() - jobs_frame.frameWidth(),
-        )
+        progress_bar_layout.setContentsMargins(jobs_frame_margins)
 
         layout = QtWidgets.QVBoxLayout()
         layout.addWidget(main_widget)
@@ -296,51 +287,70 @@ class VolumeBuilderWidget(QtWidgets.QWidget):
         self._progress = -1
         self.increment_progress()
 
-        self.build_next_volume()
-
-    @QtCore.Slot()
-    def build_next_volume(self) -> None:
-        try:
-            widget, settings = next(iter(self._jobs_map.items()))
-        except StopIteration:
+        self._queued_jobs = deque(self._jobs_map.items())
+        self._running_jobs_count = 0
+        if not self._queued_jobs:
             self.jobs_finished.emit()
             return
 
+        self.start_next_jobs()
+
+    def start_next_jobs(self) -> None:
+        """Starts queued jobs until the maximum number of concurrent jobs is reached.
+
+        Jobs work on different alignment directories so they can safely run alongside
+        each other. Within a job, interpolation still waits for the build to finish.
+        """
+        while self._queued_jobs and self._running_jobs_count < _MAX_CONCURRENT_JOBS:
+            widget, settings = self._queued_jobs.popleft()
+            self._running_jobs_count += 1
+
+            self.build_volume(widget, settings)
+
+    def build_volume(self, widget: JobWidget, settings: VolumeBuildingSettings) -> None:
         builder_thread = VolumeBuilderThread(settings, self)
         builder_thread.finished.connect(self.increment_progress)
-        builder_thread.finished.connect(self.interpolate_next_volume)
+        builder_thread.finished.connect(
+            lambda: self.interpolate_volume(widget, settings)
+        )
         builder_thread.finished.connect(builder_thread.deleteLater)
 
         builder_thread.start()
 
-    @QtCore.Slot()
-    def interpolate_next_volume(self) -> None:
-        widget, settings = next(iter(self._jobs_map.items()))
-
+    def interpolate_volume(
+        self, widget: JobWidget, settings: VolumeBuildingSettings
+    ) -> None:
         interpolator_thread = VolumeInterpolatorThread(settings, self)
         interpolator_thread.finished.connect(
             lambda: self.pop_job(widget, user_made=False)
         )
         interpolator_thread.finished.connect(self.increment_progress)
-        interpolator_thread.finished.connect(self.build_next_volume)
+        interpolator_thread.finished.connect(self.finish_job)
         interpolator_thread.finished.connect(interpolator_thread.deleteLater)
 
         interpolator_thread.start()
 
+    @QtCore.Slot()
+    def finish_job(self) -> None:
+        self._running_jobs_count -= 1
+
+        if not self._queued_jobs and self._running_jobs_count == 0:
+            self.jobs_finished.emit()
+        else:
+            self.start_next_jobs()
+
     @QtCore.Slot()
     def increment_progress(self) -> None:
         self._progress += 1
 
-        try:
-            directory_name = next(iter(self._jobs_map.items()))[
-                1
-            ].original_directory.name
-
-            if self._progress % 2 == 0:
-                message = f"Building aligned volume for '{directory_name}'."
-            else:
-                message = f"Interpolating aligned volume for '{directory_name}'."
-        except StopIteration:
+        # Several jobs can be running at once so report on all of them
+        remaining_count = len(self._jobs_map)
+        if remaining_count > 0:
+            message = (
+                f"Building and interpolating aligned volumes, {remaining_count} "
+                f"job{'' if remaining_count == 1 else 's'} remaining."
+            )
+        else:
             message = "All jobs have finished"
 
         message += " (%p%)"
@@ -350,6 +360,9 @@ class VolumeBuilderWidget(QtWidgets.QWidget):
 
 
 class JobWidget(QtWidgets.QFrame):
+    check_icon_path: Path = ICONS_ROOT / "check-mark-box-line-icon.png"
+    cross_icon_path: Path = ICONS_ROOT / "close-square-line-icon.png"
+
     remove_requested: QtCore.Signal = QtCore.Signal()
 
     def __init__(
@@ -361,13 +374,10 @@ class JobWidget(QtWidgets.QFrame):
     ) -> None:
         super().__init__(parent)
 
-        check_icon_path = ICONS_ROOT / "check-mark-box-line-icon.png"
-        cross_icon_path = ICONS_ROOT / "close-square-line-icon.png"
-
         folder_label = CutOffLabel(folder_text)
 
         z_stack_label = QtWidgets.QLabel("Z-stacks?")
-        z_stack_icon = Icon(check_icon_path if z_stacks else cross_icon_path)
+        z_stack_icon = Icon(self.check_icon_path if z_stacks else self.cross_icon_path)
 
         z_stack_layout = QtWidgets.QHBoxLayout()
         z_stack_layout.addWidget(z_stack_label)
@@ -375,7 +385,9 @@ class JobWidget(QtWidgets.QFrame):
         z_stack_layout.setAlignment(QtCore.Qt.AlignmentFlag.AlignHCenter)
 
         multi_channel_label = QtWidgets.QLabel("Multi-channel?")
-        multi_channel_icon = Icon(check_icon_path if multi_channel else cross_icon_path)
+        multi_channel_icon = Icon(
+            self.check_icon_path if multi_channel else self.cross_icon_path
+        )
 
         multi_channel_layout = QtWidgets.QHBoxLayout()
         multi_channel_layout.addWidget(multi_channel_label)
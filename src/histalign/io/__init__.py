@@ -10,6 +10,7 @@ import os
 from pathlib import Path
 import re
 import shutil
+import time
 from typing import Literal, Optional
 
 import nrrd
@@ -37,6 +38,11 @@ del data_directories
 
 ALIGNMENT_FILE_NAME_PATTERN = re.compile(r"[0-9a-f]{32}\.json")
 HASHED_DIRECTORY_NAME_PATTERN = re.compile(r"[0-9a-f]{10}")
+# Metadata files are written with the directory path as their first key, before the
+# potentially long list of slice paths.
+_METADATA_DIRECTORY_PATH_PATTERN = re.compile(
+    rb'\s*\{\s*"directory_path"\s*:\s*("(?:[^"\\]|\\.)*")'
+)
 
 _SUPPORTED_ARRAY_FORMATS = [
     ".h5",
@@ -51,6 +57,54 @@ _SUPPORTED_ARRAY_FORMATS = [
 
 _module_logger = logging.getLogger(__name__)
 
+# Maps metadata file paths to their modification time and parsed directory path
+_directory_path_cache: dict[str, tuple[int, str]] = {}
+# Maps alignment directories to their modification time and alignment file names
+_alignment_file_names_cache: dict[str, tuple[int, list[str]]] = {}
+# Directories modified more recently than this might still change without their
+# modification time changing on file systems with a coarse timestamp resolution.
+_RACY_MODIFICATION_WINDOW_NS = 2_000_000_000
+# NRRD type names (including their aliases) mapped to the numpy type they describe.
+# Kept locally rather than relying on the private table of `nrrd.reader`. Block types
+# are left out as their size is given by a separate field.
+_NRRD_TYPES = {
+    **dict.fromkeys(("signed char", "int8", "int8_t"), "i1"),
+    **dict.fromkeys(("uchar", "unsigned char", "uint8", "uint8_t"), "u1"),
+    **dict.fromkeys(
+        ("short", "short int", "signed short", "signed short int", "int16", "int16_t"),
+        "i2",
+    ),
+    **dict.fromkeys(
+        ("ushort", "unsigned short", "unsigned short int", "uint16", "uint16_t"), "u2"
+    ),
+    **dict.fromkeys(("int", "signed int", "int32", "int32_t"), "i4"),
+    **dict.fromkeys(("uint", "unsigned int", "uint32", "uint32_t"), "u4"),
+    **dict.fromkeys(
+        (
+            "longlong",
+            "long long",
+            "long long int",
+            "signed long long",
+            "signed long long int",
+            "int64",
+            "int64_t",
+        ),
+        "i8",
+    ),
+    **dict.fromkeys(
+        (
+            "ulonglong",
+            "unsigned long long",
+            "unsigned long long int",
+            "uint64",
+            "uint64_t",
+        ),
+        "u8",
+    ),
+    "float": "f4",
+    "double": "f8",
+}
+
 
 def load_image(
     path: str | Path,
@@ -72,36 +126,34 @@ def load_image(
     Returns:
         The loaded file as a NumPy array.
     """
-    file = open_file(path)
-
-    if isinstance(file, MultiSeriesImageFile):
-        if file.series_count < 1:
-            file.close()
-            raise ValueError(f"File does not have any data.")
-        elif file.series_count > 1:
-            file.close()
-            raise ValueError(f"File has more than one series.")
-
-    if "C" in file.dimension_order.value:
-        file.close()
-        raise ValueError(f"Multi-channel files are not allowed.")
-    elif "Z" in file.dimension_order.value and not allow_stack:
-        raise ValueError(
-            f"Provided file data has a Z axis but only 2D images are allowed."
-        )
+    with open_file(path) as file:
+        if isinstance(file, MultiSeriesImageFile):
+            if file.series_count < 1:
+                raise ValueError(f"File does not have any data.")
+            elif file.series_count > 1:
+                raise ValueError(f"File has more than one series.")
 
-    array = file.load()
-    if normalise_dtype is not None:
-        array = normalise_array(array, normalise_dtype)
+        if "C" in file.dimension_order.value:
+            raise ValueError(f"Multi-channel files are not allowed.")
+        elif "Z" in file.dimension_order.value and not allow_stack:
+            raise ValueError(
+                f"Provided file data has a Z axis but only 2D images are allowed."
+            )
 
-    if force_yx:
+        array = file.load()
         order = file.dimension_order
 
+    # Swap before normalising so that the normalisation copy lays out the array in YX
+    # order rather than leaving a strided view.
+    if force_yx:
         x_index = order.value.index("X")
         y_index = order.value.index("Y")
         if x_index < y_index:
             array = array.swapaxes(x_index, y_index)
 
+    if normalise_dtype is not None:
+        array = _normalise_loaded_array(array, normalise_dtype)
+
     return array
 
 
@@ -127,27 +179,15 @@ def load_volume(
     # TODO: Write NRRD plugin
     try:
         file = open_file(path, dimension_order=DimensionOrder.XYZ)
-
-        if isinstance(file, MultiSeriesImageFile):
-            if file.series_count < 1:
-                file.close()
-                raise ValueError(f"File does not have any data.")
-            elif file.series_count > 1:
-                file.close()
-                raise ValueError(f"File has more than one series.")
-
-        if "C" in file.dimension_order.value:
-            file.close()
-            raise ValueError(f"Multi-channel files are not allowed.")
-        elif "Z" not in file.dimension_order.value:
-            raise ValueError(
-                f"Provided file data is only two-dimensional. Expected a volume."
-            )
-
-        array = file.load()
     except UnknownFileFormatError:
         suffix = Path(path).suffix
-        if suffix == ".nrrd":
+        if suffix != ".nrrd":
+            # Continue raising
+            raise
+
+        # Uncompressed files can be mapped rather than read in full
+        array = _memory_map_nrrd(path)
+        if array is None:
             # `nrrd` normally loads files in chunks of 4GiB but the `zlib` decompressor
             # memory usage blows up (uses something around 10x the size of the array)
             # when loading the 10 microns annotation volume. This reduces the chunk size
@@ -158,16 +198,70 @@ def load_volume(
             nrrd.reader._READ_CHUNKSIZE = 2**16
             array = nrrd.read(path)[0]
             nrrd.reader._READ_CHUNKSIZE = backup_value
-        else:
-            # Continue raising
-            raise
+    else:
+        with file:
+            if isinstance(file, MultiSeriesImageFile):
+                if file.series_count < 1:
+                    raise ValueError(f"File does not have any data.")
+                elif file.series_count > 1:
+                    raise ValueError(f"File has more than one series.")
+
+            if "C" in file.dimension_order.value:
+                raise ValueError(f"Multi-channel files are not allowed.")
+            elif "Z" not in file.dimension_order.value:
+                raise ValueError(
+                    f"Provided file data is only two-dimensional. Expected a volume."
+                )
+
+            array = file.load()
 
     if normalise_dtype is not None:
-        array = normalise_array(array, normalise_dtype)
+        array = _normalise_loaded_array(array, normalise_dtype)
 
     return array if as_array else vedo.Volume(array)
 
 
+def _normalise_loaded_array(array: np.ndarray, dtype: np.dtype) -> np.ndarray:
+    """Normalises a freshly loaded array, in-place when it already has `dtype`.
+
+    Arrays of an integer `dtype` which already span its whole range are returned as-is
+    since normalising them would not change any value.
+
+    Args:
+        array (np.ndarray): Array to normalise.
+        dtype (np.dtype): Data type to normalise to.
+
+    Returns:
+        The normalised array.
+    """
+    # Compute the range once, both for the check below and for normalising
+    minimum = maximum = None
+    if array.ndim > 0 and array.size > 0:
+        minimum = array.min()
+        maximum = array.max()
+
+        if (
+            array.dtype == dtype
+            and np.issubdtype(dtype, np.integer)
+            and minimum == 0
+            and maximum == np.iinfo(dtype).max
+        ):
+            return array
+
+    # Reusing the loaded array saves allocating and going over a second one. It needs
+    # to be C-contiguous to keep the layout a new array would have.
+    out = None
+    if (
+        array.dtype == dtype
+        and array.flags.writeable
+        and array.flags.c_contiguous
+        and array.ndim > 0
+    ):
+        out = array
+
+    return normalise_array(array, dtype, out=out, minimum=minimum, maximum=maximum)
+
+
 # noinspection PyUnboundLocalVariable
 def open_file(
     path: str | Path,
@@ -201,8 +295,59 @@ def load_alignment_settings(path: str | Path) -> AlignmentSettings:
     Returns:
         A model with fields initialised to the parsed values.
     """
-    with open(path) as handle:
-        return AlignmentSettings(**json.load(handle))
+    with open(path, "rb") as handle:
+        return AlignmentSettings.model_validate_json(handle.read())
+
+
+def _memory_map_nrrd(path: str | Path) -> Optional[np.ndarray]:
+    """Memory-maps the data of an uncompressed NRRD file.
+
+    Only the parts of the volume which are accessed are then read from disk. The map is
+    copy-on-write so the array can still be modified in memory without affecting the
+    file.
+
+    Args:
+        path (str | Path): Path to the NRRD file.
+
+    Returns:
+        The memory-mapped array in the same (Fortran) order as `nrrd.read`, or `None`
+        if the data cannot be mapped (e.g., it is compressed).
+    """
+    try:
+        with open(path, "rb") as handle:
+            header = nrrd.read_header(handle)
+            offset = handle.tell()
+
+        if header["encoding"] != "raw" or header.get(
+            "lineskip", header.get("line skip", 0)
+        ):
+            return None
+
+        data_path = Path(path)
+        data_file = header.get("datafile", header.get("data file"))
+        if data_file is not None:
+            data_path = data_path.parent / data_file
+            offset = 0
+        offset += header.get("byteskip", header.get("byte skip", 0))
+
+        dtype = np.dtype(_NRRD_TYPES[header["type"]])
+        if dtype.itemsize > 1:
+            dtype = dtype.newbyteorder(
+                "<" if header.get("endian", "little") == "little" else ">"
+            )
+
+        return np.memmap(
+            data_path,
+            dtype=dtype,
+            mode="c",
+            offset=offset,
+            shape=tuple(int(size) for size in header["sizes"]),
+            order="F",
+        )
+    except (nrrd.NRRDError, KeyError, OSError, ValueError) as error:
+        _module_logger.debug(f"Could not memory-map '{path}', reading it instead.")
+        _module_logger.debug(error)
+        return None
 
 
 def is_alignment_file(path: str | Path) -> bool:
@@ -215,14 +360,11 @@ def is_alignment_file(path: str | Path) -> bool:
         Whether the file path points to an alignment settings file.
     """
 
-    path = Path(path)
-
-    # Add extra check to make sure this is a not a hidden file (doesn't start with a
-    # period)
+    # Check the name first as it does not need to hit the file system. The pattern
+    # already excludes hidden files (starting with a period).
     return (
-        path.is_file()
-        and re.fullmatch(ALIGNMENT_FILE_NAME_PATTERN, path.name) is not None
-        and not path.name.startswith(".")
+        ALIGNMENT_FILE_NAME_PATTERN.fullmatch(os.path.basename(path)) is not None
+        and os.path.isfile(path)
     )
 
 
@@ -239,14 +381,10 @@ def gather_alignment_paths(alignment_directory: str | Path) -> list[Path]:
     """
     alignment_directory = Path(alignment_directory)
 
-    paths = []
-    for file in alignment_directory.iterdir():
-        if not is_alignment_file(file):
-            continue
-
-        paths.append(file)
-
-    return paths
+    return [
+        alignment_directory / name
+        for name in _list_alignment_file_names(alignment_directory)
+    ]
 
 
 def is_empty_directory(path: Path) -> bool:
@@ -294,25 +432,93 @@ def list_alignment_directories(
     project_root: Path, allow_empty: bool = False
 ) -> list[str]:
     directories = []
-    for path in project_root.iterdir():
-        if (
-            path.is_file()
-            or re.fullmatch(HASHED_DIRECTORY_NAME_PATTERN, path.name) is None
-        ):
-            continue
+    with os.scandir(project_root) as iterator:
+        for entry in iterator:
+            if (
+                HASHED_DIRECTORY_NAME_PATTERN.fullmatch(entry.name) is None
+                or not entry.is_dir()
+            ):
+                continue
 
-        metadata_path = path / "metadata.json"
-        if not metadata_path.exists():
-            continue
+            metadata_path = os.path.join(entry.path, "metadata.json")
+            try:
+                modification_time = os.stat(metadata_path).st_mtime_ns
+            except FileNotFoundError:
+                continue
 
-        for child_path in path.iterdir():
-            if is_alignment_file(child_path):
-                break
-        else:
-            if not allow_empty:
+            if not allow_empty and not _contains_alignment_file(entry.path):
                 continue
 
-        with metadata_path.open() as handle:
-            directories.append(json.load(handle)["directory_path"])
+            # Only parse metadata files which changed since they were last read
+            cached_entry = _directory_path_cache.get(metadata_path)
+            if cached_entry is None or cached_entry[0] != modification_time:
+                cached_entry = (
+                    modification_time,
+                    _read_metadata_directory_path(metadata_path),
+                )
+                _directory_path_cache[metadata_path] = cached_entry
+
+            directories.append(cached_entry[1])
 
     return directories
+
+
+def _read_metadata_directory_path(path: str | Path) -> str:
+    """Reads the directory path out of an alignment directory's metadata file.
+
+    When the directory path comes first in the file, only it is decoded. Otherwise, the
+    whole file is parsed.
+
+    Args:
+        path (str | Path): Path to the metadata file.
+
+    Returns:
+        The path of the directory the alignment directory was created for.
+    """
+    with open(path, "rb") as handle:
+        contents = handle.read()
+
+    match = _METADATA_DIRECTORY_PATH_PATTERN.match(contents)
+    if match is not None:
+        return json.loads(match.group(1))
+
+    return json.loads(contents)["directory_path"]
+
+
+def _contains_alignment_file(directory: str | Path) -> bool:
+    return len(_list_alignment_file_names(directory)) > 0
+
+
+def _list_alignment_file_names(directory: str | Path) -> list[str]:
+    """Lists the names of the alignment files in a directory.
+
+    Adding or removing a file updates the modification time of its directory so the
+    names are only scanned again when that changes.
+
+    Args:
+        directory (str | Path): Directory to scan.
+
+    Returns:
+        The names of the alignment files in the directory.
+    """
+    directory = os.fspath(directory)
+    modification_time = os.stat(directory).st_mtime_ns
+
+    cached_entry = _alignment_file_names_cache.get(directory)
+    if cached_entry is not None and cached_entry[0] == modification_time:
+        return cached_entry[1]
+
+    # Scanning avoids a `stat` call per file as entries already know their type. The
+    # pattern already excludes hidden files.
+    with os.scandir(directory) as iterator:
+        names = [
+            entry.name
+            for entry in iterator
+            if ALIGNMENT_FILE_NAME_PATTERN.fullmatch(entry.name) is not None
+            and entry.is_file()
+        ]
+
+    if time.time_ns() - modification_time > _RACY_MODIFICATION_WINDOW_NS:
+        _alignment_file_names_cache[directory] = (modification_time, names)
+
+    return names
@@ -2,8 +2,12 @@
 #
 # SPDX-License-Identifier: MIT
 
-from collections.abc import Iterable, Sequence
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from itertools import islice
 import logging
+import math
+import os
 from pathlib import Path
 from typing import Optional
 
@@ -16,6 +20,7 @@ from histalign.io.image import (
     EXTENSIONS,
     generate_indices,
     get_appropriate_plugin_class,
+    ImageFile,
     MultiSeriesImageFile,
     remove_extra_dimensions,
     translate_between_orders,
@@ -25,6 +30,9 @@ from histalign.io.image.metadata import prune_metadata
 
 _module_logger = logging.getLogger(__name__)
 
+# Number of JPEG sources decoded together on the GPU
+_GPU_DECODE_BATCH_SIZE = 32
+
 
 @click.command(help="Convert files to a different format.")
 @click.argument(
@@ -98,6 +106,25 @@ _module_logger = logging.getLogger(__name__)
     is_flag=True,
     help="Whether to overwrite destination files if they already exist.",
 )
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    required=False,
+    default=1,
+    help=(
+        "Number of files to convert concurrently when 'SOURCE' is a directory. Each "
+        "file is loaded in memory separately so keep this low for large files."
+    ),
+)
+@click.option(
+    "--gpu-decode",
+    is_flag=True,
+    help=(
+        "Whether to decode JPEG sources on the GPU. This requires PyTorch, torchvision "
+        "and a CUDA device, falling back to the CPU otherwise."
+    ),
+)
 def convert(
     source: Path,
     destination: Optional[Path],
@@ -107,6 +134,8 @@ def convert(
     to_order: str,
     series_support_override: int,
     force: bool,
+    jobs: int,
+    gpu_decode: bool = False,
 ) -> None:
     """Converts from `source` to `destination` as determined by extensions.
 
@@ -133,6 +162,8 @@ def convert(
             Override the level of support of the destination format.
         force (bool):
             Whether to overwrite files during conversion if they already exist.
+        jobs (int): Number of files to convert concurrently.
+        gpu_decode (bool): Whether to decode JPEG sources on the GPU when possible.
     """
     if source.is_dir() and not source_extension:
         raise ValueError(
@@ -158,19 +189,59 @@ def convert(
     else:
         to_order: DimensionOrder = DimensionOrder(to_order.upper())
 
-    for source_path, destination_path in generate_jobs(
+    conversion_jobs = generate_jobs(
         source, destination, source_extension, destination_extension
-    ):
-        _module_logger.info(f"Starting conversion of '{source_path}'.")
-        _convert(
-            source_path,
-            destination_path,
-            from_order,
-            to_order,
-            series_support_override,
-            force,
+    )
+    if gpu_decode:
+        conversion_jobs = _decode_jpeg_sources(conversion_jobs)
+    else:
+        conversion_jobs = (
+            (source_path, destination_path, None)
+            for source_path, destination_path in conversion_jobs
         )
 
+    if jobs == 1:
+        for source_path, destination_path, source_image in conversion_jobs:
+            _convert(
+                source_path,
+                destination_path,
+                from_order,
+                to_order,
+                series_support_override,
+                force,
+                gpu_decode,
+                source_image,
+            )
+        return
+
+    # Decoding and encoding mostly release the GIL so threads are enough to overlap
+    # files, without having to pickle arguments or errors across processes. Only
+    # submit a few jobs ahead of the workers to keep generating them lazily.
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures: set[Future] = set()
+        for source_path, destination_path, source_image in conversion_jobs:
+            if len(futures) >= 2 * jobs:
+                done, futures = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    future.result()
+
+            futures.add(
+                executor.submit(
+                    _convert,
+                    source_path,
+                    destination_path,
+                    from_order,
+                    to_order,
+                    series_support_override,
+                    force,
+                    gpu_decode,
+                    source_image,
+                )
+            )
+
+        for future in futures:
+            future.result()
+
 
 def _convert(
     source_path: Path,
@@ -179,10 +250,18 @@ def _convert(
     destination_order: Optional[DimensionOrder],
     series_support_override: int,
     force: bool,
+    gpu_decode: bool = False,
+    source_image: Optional[np.ndarray] = None,
 ) -> None:
+    _module_logger.info(f"Starting conversion of '{source_path}'.")
+
     source_plugin_class = get_appropriate_plugin_class(source_path, mode="r")
     source_file = source_plugin_class(
-        source_path, mode="r", dimension_order=source_order
+        source_path,
+        mode="r",
+        dimension_order=source_order,
+        gpu_decode=gpu_decode,
+        image=source_image,
     )
     source_order = source_file.dimension_order
     current_destination_order = destination_order
@@ -206,11 +285,23 @@ def _convert(
         )
 
     cached_destination_path = None
+    # Reused across images to hold the transposed image when it is not contiguous
+    transpose_buffer: Optional[np.ndarray] = None
+    # Reshape and transpose only depend on the image shape and orders so are only
+    # worked out again when those change.
+    image_layout_key = None
+    reshaped_shape: tuple[int, ...] = ()
+    translated_image_axis_order: tuple[int, ...] = ()
     for series_index in range(
         source_file.series_count if isinstance(source_file, MultiSeriesImageFile) else 1
     ):
-        for image_number, image_index in enumerate(
-            generate_indices(source_order, source_file.shape, source_order)
+        # Extracting metadata can mean parsing OME-XML so only do it once per series
+        source_metadata = None
+        for image_number, (image_index, read_image) in enumerate(
+            _prefetch_images(
+                source_file,
+                generate_indices(source_order, source_file.shape, source_order),
+            )
         ):
             if destination_file is None:
                 # Determine destination dimension order
@@ -242,14 +333,19 @@ def _convert(
                 else:
                     appended_destination_path = destination_path
 
+                if source_metadata is None:
+                    source_metadata = source_file.metadata
+                    # Whether the source holds more than a single plane
+                    source_has_several_planes = math.prod(source_file.shape) > (
+                        source_metadata.SizeX * source_metadata.SizeY
+                    )
+
                 if (
                     not destination_supports_multi_series
                     and not destination_supports_series
                 ) or (
                     len(current_destination_order.value) == 2
-                    and np.prod(source_file.shape)
-                    / (source_file.metadata.SizeX * source_file.metadata.SizeY)
-                    > 1
+                    and source_has_several_planes
                 ):
                     appended_destination_path = append_to_stem(
                         appended_destination_path, f"image{image_number}"
@@ -273,8 +369,7 @@ def _convert(
                     continue
 
                 # Pass over the metadata
-                metadata = source_file.metadata
-                metadata = prune_metadata(metadata, current_destination_order)
+                metadata = prune_metadata(source_metadata, current_destination_order)
 
                 _module_logger.debug(
                     f"Opening destination path '{appended_destination_path}'."
@@ -295,27 +390,40 @@ def _convert(
                 image_index, source_order, current_destination_order
             )
 
-            image = source_file.read_image(image_index)
-            translated_image_axis_order = translate_between_orders(
-                list(range(len(image.shape))),
-                source_order,
-                current_destination_order,
-            )
-            # Ensure indices start at 0 and are sequential.
-            translated_image_axis_order = tuple(
-                sorted(translated_image_axis_order).index(i)
-                for i in translated_image_axis_order
-            )
+            image = read_image()
+            if image_layout_key != (image.shape, current_destination_order):
+                image_layout_key = (image.shape, current_destination_order)
 
-            # Translate (reshape and transpose) image as appropriate for destination
-            # Remove extra dimensions without completely squeezing (some 1-size
-            # dimensions might need to be kept).
-            image = image.reshape(
-                remove_extra_dimensions(
+                translated_image_axis_order = translate_between_orders(
+                    list(range(len(image.shape))),
+                    source_order,
+                    current_destination_order,
+                )
+                # Ensure indices start at 0 and are sequential.
+                translated_image_axis_order = tuple(
+                    sorted(translated_image_axis_order).index(i)
+                    for i in translated_image_axis_order
+                )
+
+                # Remove extra dimensions without completely squeezing (some 1-size
+                # dimensions might need to be kept).
+                reshaped_shape = remove_extra_dimensions(
                     image.shape, source_order, current_destination_order
                 )
-            )
+
+            # Translate (reshape and transpose) image as appropriate for destination
+            image = image.reshape(reshaped_shape)
             image = np.transpose(image, translated_image_axis_order)
+            # Most writers need contiguous data and would otherwise copy every image
+            if not image.flags.c_contiguous:
+                if (
+                    transpose_buffer is None
+                    or transpose_buffer.shape != image.shape
+                    or transpose_buffer.dtype != image.dtype
+                ):
+                    transpose_buffer = np.empty(image.shape, dtype=image.dtype)
+                np.copyto(transpose_buffer, image)
+                image = transpose_buffer
 
             destination_file.write_image(image, translated_index)
 
@@ -397,9 +505,12 @@ def generate_jobs(
     destination: Optional[Path],
     source_extension: str,
     destination_extension: str,
-) -> list[tuple[Path, Path]]:
+) -> Iterator[tuple[Path, Path]]:
     """Generates pairs of source-destination paths with proper extensions.
 
+    Pairs are generated lazily so that large directories can be processed without
+    building the whole list of jobs first.
+
     Args:
         source (Path):
             Path to use as the basis for jobs. If this is a file, a single pair is
@@ -413,8 +524,8 @@ def generate_jobs(
             otherwise.
         destination_extension (str): Extension to set on the destination files.
 
-    Returns:
-        A list of (`source`, `destination`) path tuples where `source` is a path with
+    Yields:
+        (`source`, `destination`) path tuples where `source` is a path with
         `source_extension` and `destination` is the corresponding destination with
         `destination_extension`.
     """
@@ -427,25 +538,130 @@ def generate_jobs(
         raise ValueError("Expected `None` or directory for `destination`. Got file.")
 
     if source.is_file():
-        return [
-            (
-                source,
-                destination
-                # Only replace the last occurrence
-                / source.name[::-1].replace(
-                    source_extension[::-1], destination_extension[::-1], 1
-                )[::-1],
-            )
-        ]
+        yield (
+            source,
+            _build_destination_path(
+                source, destination, source_extension, destination_extension
+            ),
+        )
     else:
-        jobs = []
-        for file_path in source.glob(f"[!.]*{source_extension}"):
-            jobs.extend(
-                generate_jobs(
+        # Scanning avoids a `stat` call per file as entries already know their type.
+        # The entries are listed up front as conversions write to the destination
+        # while jobs are consumed, which might be the directory being scanned.
+        with os.scandir(source) as iterator:
+            entries = [
+                entry
+                for entry in iterator
+                if not entry.name.startswith(".")
+                and entry.name.endswith(source_extension)
+            ]
+
+        for entry in entries:
+            file_path = Path(entry.path)
+            if entry.is_file():
+                yield (
+                    file_path,
+                    _build_destination_path(
+                        file_path, destination, source_extension, destination_extension
+                    ),
+                )
+            else:
+                yield from generate_jobs(
                     file_path, destination, source_extension, destination_extension
                 )
+
+
+def _build_destination_path(
+    source: Path, destination: Path, source_extension: str, destination_extension: str
+) -> Path:
+    name = source.name
+
+    # Only replace the last occurrence
+    index = name.rfind(source_extension)
+    if index != -1:
+        name = (
+            name[:index] + destination_extension + name[index + len(source_extension) :]
+        )
+
+    return destination / name
+
+
+def _decode_jpeg_sources(
+    jobs: Iterable[tuple[Path, Path]],
+) -> Iterator[tuple[Path, Path, Optional[np.ndarray]]]:
+    """Decodes the JPEG sources of jobs on the GPU in batches.
+
+    Jobs are still yielded in order, only being decoded a batch ahead.
+
+    Args:
+        jobs (Iterable[tuple[Path, Path]]): Source and destination paths of the jobs.
+
+    Yields:
+        The source and destination paths of the next job along with its decoded source
+        image, or `None` if it was not decoded.
+    """
+    from histalign.io.image.GenericImagePlugin import decode_jpegs_on_gpu
+
+    jobs = iter(jobs)
+    while batch := list(islice(jobs, _GPU_DECODE_BATCH_SIZE)):
+        jpeg_positions = [
+            position
+            for position, (source_path, _) in enumerate(batch)
+            if source_path.suffix.lower() in (".jpg", ".jpeg")
+        ]
+        images: list[Optional[np.ndarray]] = [None] * len(batch)
+        decoded_images = decode_jpegs_on_gpu(
+            [batch[position][0] for position in jpeg_positions]
+        )
+        for position, image in zip(jpeg_positions, decoded_images):
+            images[position] = image
+
+        for (source_path, destination_path), image in zip(batch, images):
+            yield source_path, destination_path, image
+
+
+def _prefetch_images(
+    source_file: ImageFile, indices: Iterable[tuple[slice, ...]]
+) -> Iterator[tuple[tuple[slice, ...], Callable[[], np.ndarray]]]:
+    """Pairs indices with functions reading them, prefetching the next image.
+
+    Reading an image starts reading the next one in a background thread so that
+    reading overlaps with processing and writing the current one. Nothing is read
+    ahead until an image is actually read so that skipped images are not loaded.
+
+    Args:
+        source_file (ImageFile): File to read the images from.
+        indices (Iterable[tuple[slice, ...]]): Indices of the images to read.
+
+    Yields:
+        The next index and a function returning the image at that index.
+    """
+    indices = list(indices)
+    futures: dict[int, Future] = {}
+
+    def read(position: int) -> np.ndarray:
+        future = futures.pop(position, None)
+        if future is None:
+            image = source_file.read_image(indices[position])
+        else:
+            image = future.result()
+
+        if position + 1 < len(indices):
+            futures[position + 1] = executor.submit(
+                source_file.read_image, indices[position + 1]
             )
-        return jobs
+
+        return image
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        for position, index in enumerate(indices):
+            # Drop the prefetched image of a skipped index, waiting for it if it is
+            # already being read since the source file is not safe to share.
+            stale_future = futures.pop(position - 1, None)
+            if stale_future is not None and not stale_future.cancel():
+                wait((stale_future,))
+
+            yield index, lambda position=position: read(position)
 
 
 def append_to_stem(path: Path, string: str, separator: str = "_") -> Path:
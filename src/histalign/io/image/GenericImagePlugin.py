@@ -2,9 +2,16 @@
 #
 # SPDX-License-Identifier: MIT
 
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import logging
+import os
 from pathlib import Path
-from typing import Optional
+import struct
+from typing import Any, Optional, Sequence
+import zlib
 
+import cv2
 import numpy as np
 from PIL import Image
 
@@ -12,9 +19,45 @@ from histalign.io import DimensionOrder
 from histalign.io.image import ImageFile, register_plugin
 from histalign.io.image.metadata import OmeXml
 
+_module_logger = logging.getLogger(__name__)
+
 # Allow fie sizes up to 1 GiB
 Image.MAX_IMAGE_PIXELS = 1024**3
 
+# Pillow modes which OpenCV can decode to the same array, mapped to the conversion from
+# OpenCV's channel order.
+_OPENCV_MODES = {
+    "L": None,
+    "I;16": None,
+    "RGB": cv2.COLOR_BGR2RGB,
+    "RGBA": cv2.COLOR_BGRA2RGBA,
+}
+# Pillow modes mapped to the channel count and data type of their decoded array. This
+# also holds for 16-bit colour PNGs as they are left to Pillow, which reduces them to
+# 8 bits (see `_is_decoded_alike`).
+_MODE_LAYOUTS = {
+    "L": (1, np.dtype(np.uint8)),
+    "I;16": (1, np.dtype(np.uint16)),
+    "RGB": (3, np.dtype(np.uint8)),
+    "RGBA": (4, np.dtype(np.uint8)),
+}
+# Channel counts mapped to the conversion to OpenCV's channel order when encoding
+_OPENCV_ENCODINGS = {
+    1: None,
+    3: cv2.COLOR_RGB2BGR,
+    4: cv2.COLOR_RGBA2BGRA,
+}
+# Pillow modes of JPEG images nvJPEG decodes to the same array
+_GPU_JPEG_MODES = ("L", "RGB")
+# Trades some file size for a much faster deflate than Pillow's default level
+DEFAULT_PNG_COMPRESSION_LEVEL = 3
+# Images at least this large are deflated in strips on several threads
+_PARALLEL_PNG_MINIMUM_BYTES = 2**22
+_MAXIMUM_PNG_STRIPS = 8
+# Channel counts mapped to their PNG colour type
+_PNG_COLOUR_TYPES = {1: 0, 3: 2, 4: 6}
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
 
 class GenericImagePlugin(ImageFile):
     format: str = "MISC"
@@ -24,10 +67,20 @@ class GenericImagePlugin(ImageFile):
 
     @property
     def shape(self) -> tuple[int, ...]:
+        # Answer from the header when possible rather than decoding the whole image
+        layout = _MODE_LAYOUTS.get(self.file_handle.mode)
+        if self._cache is None and layout is not None:
+            width, height = self.file_handle.size
+            return (height, width) if layout[0] == 1 else (height, width, layout[0])
+
         return self.read_image(tuple()).shape
 
     @property
     def dtype(self) -> np.dtype:
+        layout = _MODE_LAYOUTS.get(self.file_handle.mode)
+        if self._cache is None and layout is not None:
+            return layout[1]
+
         return self.read_image(tuple()).dtype
 
     def _open(
@@ -35,6 +88,13 @@ class GenericImagePlugin(ImageFile):
     ) -> None:
         self._file_path = file_path
         self._cache = None
+        self._compression_level = kwargs.get(
+            "compression_level", DEFAULT_PNG_COMPRESSION_LEVEL
+        )
+        self._gpu_decode = kwargs.get("gpu_decode", False)
+        if mode == "r":
+            # Allow callers to hand over an image they already decoded in a batch
+            self._cache = kwargs.get("image")
         if mode == "r":
             self.file_handle = Image.open(file_path, mode="r")
         else:
@@ -53,24 +113,322 @@ class GenericImagePlugin(ImageFile):
 
     def read_image(self, index: tuple[slice, ...]) -> np.ndarray:
         if self._cache is None:
-            self._cache = np.array(self.file_handle)
+            self._cache = self._decode()
 
         return self._cache
 
+    def _decode(self) -> np.ndarray:
+        # OpenCV decodes straight into an array using libjpeg-turbo and is noticeably
+        # faster than converting a Pillow image, which goes through an extra copy.
+        # Pillow is only kept around for the modes OpenCV would decode differently
+        # (e.g., palettes or bilevel images).
+        mode = self.file_handle.mode
+        if (
+            self._gpu_decode
+            and self.file_handle.format == "JPEG"
+            and mode in _GPU_JPEG_MODES
+        ):
+            array = _decode_jpeg_on_gpu(self._file_path)
+            if array is not None:
+                return array
+
+        if _is_decoded_alike(self.file_handle):
+            # Decoding from memory rather than with `imread` supports non-ASCII paths
+            array = cv2.imdecode(
+                np.fromfile(self._file_path, dtype=np.uint8), cv2.IMREAD_UNCHANGED
+            )
+            if array is not None:
+                conversion = _OPENCV_MODES[mode]
+                if conversion is not None:
+                    cv2.cvtColor(array, conversion, dst=array)
+
+                return array
+
+        return np.array(self.file_handle)
+
     def write_image(self, image: np.ndarray, index: tuple[slice, ...]) -> None:
-        self.file_handle = Image.fromarray(image)
-        self.file_handle.save(self._file_path, format="PNG")
+        if not self._encode(image):
+            self.file_handle = Image.fromarray(image)
+            self.file_handle.save(
+                self._file_path, format="PNG", compress_level=self._compression_level
+            )
+
+    def _encode(self, image: np.ndarray) -> bool:
+        # OpenCV encodes with libpng and is noticeably faster than Pillow. Pillow is
+        # only kept around for the images OpenCV cannot write as PNG (e.g., signed or
+        # floating point data types).
+        channels = 1 if image.ndim == 2 else image.shape[-1]
+        if (
+            image.ndim not in (2, 3)
+            or channels not in _OPENCV_ENCODINGS
+            or image.dtype not in (np.uint8, np.uint16)
+        ):
+            return False
+
+        strip_count = min(os.cpu_count() or 1, _MAXIMUM_PNG_STRIPS)
+        if image.nbytes >= _PARALLEL_PNG_MINIMUM_BYTES and strip_count > 1:
+            buffer = np.frombuffer(
+                _encode_png_in_strips(image, self._compression_level, strip_count),
+                dtype=np.uint8,
+            )
+        else:
+            conversion = _OPENCV_ENCODINGS[channels]
+            if image.ndim == 3 and conversion is not None:
+                image = cv2.cvtColor(image, conversion)
+
+            success, buffer = cv2.imencode(
+                ".png", image, [cv2.IMWRITE_PNG_COMPRESSION, self._compression_level]
+            )
+            if not success:
+                return False
+
+        # Writing from memory rather than with `imwrite` supports non-ASCII paths
+        buffer.tofile(self._file_path)
+
+        return True
 
     def _extract_metadata(self) -> OmeXml:
+        sizes = dict(zip(self.dimension_order.value, self.shape))
+
         return OmeXml(
             DimensionOrder=self.dimension_order,
-            SizeX=self.shape[self.dimension_order.value.index("X")],
-            SizeY=self.shape[self.dimension_order.value.index("Y")],
+            SizeX=sizes["X"],
+            SizeY=sizes["Y"],
             Type=self.dtype,
             Channel=[],
         )
 
 
+def _encode_png_in_strips(
+    image: np.ndarray, compression_level: int, strip_count: int
+) -> bytes:
+    """Encodes an image as a PNG, deflating horizontal strips of it in parallel.
+
+    Each strip is deflated on its own thread (zlib releases the GIL) and flushed to a
+    byte boundary so that the strips can be concatenated into a single valid stream,
+    the same way `pigz` parallelises gzip. Rows are filtered with the PNG "Sub" filter
+    which is cheap to vectorise and compresses about as well as adaptive filtering on
+    microscopy images.
+
+    Args:
+        image (np.ndarray): 8- or 16-bit grey, RGB, or RGBA image to encode.
+        compression_level (int): Deflate compression level.
+        strip_count (int): Number of strips to deflate in parallel.
+
+    Returns:
+        The encoded PNG file.
+    """
+    height, width = image.shape[:2]
+    channels = 1 if image.ndim == 2 else image.shape[-1]
+    bytes_per_pixel = channels * image.dtype.itemsize
+
+    # PNG samples are big-endian
+    rows = np.ascontiguousarray(
+        image.astype(image.dtype.newbyteorder(">"), copy=False)
+    ).view(np.uint8)
+    rows = rows.reshape(height, -1)
+
+    # Every row starts with its filter type followed by each byte minus the byte of
+    # the previous pixel (wrapping around).
+    filtered = np.empty((height, rows.shape[1] + 1), dtype=np.uint8)
+    filtered[:, 0] = 1
+    filtered[:, 1 : 1 + bytes_per_pixel] = rows[:, :bytes_per_pixel]
+    np.subtract(
+        rows[:, bytes_per_pixel:],
+        rows[:, :-bytes_per_pixel],
+        out=filtered[:, 1 + bytes_per_pixel :],
+    )
+    data = memoryview(filtered).cast("B")
+
+    strip_size = -(-height // strip_count) * filtered.shape[1]
+    starts = range(0, len(data), strip_size)
+
+    def deflate(start: int) -> bytes:
+        compressor = zlib.compressobj(compression_level, zlib.DEFLATED, -zlib.MAX_WBITS)
+        is_last = start + strip_size >= len(data)
+
+        return compressor.compress(data[start : start + strip_size]) + compressor.flush(
+            zlib.Z_FINISH if is_last else zlib.Z_SYNC_FLUSH
+        )
+
+    with ThreadPoolExecutor(max_workers=strip_count) as executor:
+        strips = list(executor.map(deflate, starts))
+
+    # Wrap the raw deflate stream in a zlib header and trailer. The level flag only
+    # informs decoders, following zlib's own choice of flag for each level.
+    level = 6 if compression_level < 0 else compression_level
+    level_flag = 0 if level < 2 else 1 if level < 6 else 2 if level == 6 else 3
+    header = 0x7800 | (level_flag << 6)
+    header += 31 - header % 31
+    stream = b"".join(
+        [struct.pack(">H", header), *strips, struct.pack(">I", zlib.adler32(data))]
+    )
+
+    return b"".join(
+        [
+            _PNG_SIGNATURE,
+            _build_png_chunk(
+                b"IHDR",
+                struct.pack(
+                    ">IIBBBBB",
+                    width,
+                    height,
+                    image.dtype.itemsize * 8,
+                    _PNG_COLOUR_TYPES[channels],
+                    0,
+                    0,
+                    0,
+                ),
+            ),
+            _build_png_chunk(b"IDAT", stream),
+            _build_png_chunk(b"IEND", b""),
+        ]
+    )
+
+
+def _build_png_chunk(chunk_type: bytes, data: bytes) -> bytes:
+    return b"".join(
+        [
+            struct.pack(">I", len(data)),
+            chunk_type,
+            data,
+            struct.pack(">I", zlib.crc32(data, zlib.crc32(chunk_type))),
+        ]
+    )
+
+
+def _is_decoded_alike(image: Image.Image) -> bool:
+    """Returns whether OpenCV decodes an image to the same array as Pillow.
+
+    Args:
+        image (Image.Image): Image opened by Pillow but not yet loaded.
+
+    Returns:
+        bool: Whether OpenCV decodes the image to the same array as Pillow.
+    """
+    if image.mode not in _OPENCV_MODES:
+        return False
+
+    # Pillow reports 16-bit colour PNGs with an 8-bit mode and reduces them to 8 bits
+    # when decoding whereas OpenCV keeps all 16 bits.
+    if image.mode in ("RGB", "RGBA") and image.tile:
+        raw_mode = image.tile[0][3]
+        if isinstance(raw_mode, tuple):
+            raw_mode = raw_mode[0]
+        if isinstance(raw_mode, str) and ";16" in raw_mode:
+            return False
+
+    return True
+
+
+@lru_cache(maxsize=1)
+def _get_gpu_jpeg_decoder() -> Optional[tuple[Any, Any]]:
+    """Imports the GPU JPEG decoder, returning `None` when it is not available.
+
+    The import is deferred to the first GPU decode since PyTorch is slow to import and
+    the decoder is optional.
+
+    Returns:
+        The `torch` module and `torchvision.io.decode_jpeg` if PyTorch, torchvision and
+        a CUDA device are available, `None` otherwise.
+    """
+    try:
+        import torch
+        from torchvision.io import decode_jpeg
+    except ImportError:
+        _module_logger.debug(
+            "PyTorch and torchvision are required to decode JPEGs on the GPU."
+        )
+        return None
+
+    if not torch.cuda.is_available():
+        _module_logger.debug("No CUDA device available to decode JPEGs on the GPU.")
+        return None
+
+    return torch, decode_jpeg
+
+
+def _decode_jpeg_on_gpu(file_path: Path) -> Optional[np.ndarray]:
+    """Decodes a JPEG file using nvJPEG through torchvision.
+
+    Args:
+        file_path (Path): Path to the JPEG file to decode.
+
+    Returns:
+        The decoded image in the same layout as Pillow would return it, or `None` if
+        the GPU decoder is not available or failed to decode the file.
+    """
+    if (decoder := _get_gpu_jpeg_decoder()) is None:
+        return None
+    torch, decode_jpeg = decoder
+
+    try:
+        data = torch.from_numpy(np.fromfile(file_path, dtype=np.uint8))
+        tensor = decode_jpeg(data, device="cuda")
+    except Exception as error:
+        _module_logger.debug(f"Failed to decode '{file_path}' on the GPU.")
+        _module_logger.debug(error)
+        return None
+
+    return _tensor_to_array(tensor)
+
+
+def decode_jpegs_on_gpu(file_paths: Sequence[Path]) -> list[Optional[np.ndarray]]:
+    """Decodes a batch of JPEG files in a single nvJPEG call through torchvision.
+
+    Decoding files in batches amortises the kernel launches and transfers over the
+    whole batch rather than paying for them with each file.
+
+    Args:
+        file_paths (Sequence[Path]): Paths to the JPEG files to decode.
+
+    Returns:
+        The decoded images in the same layout as Pillow would return them, in the order
+        of `file_paths`. Files which are not JPEGs nvJPEG can decode like Pillow, or
+        all files if the decoder is not available or fails, are `None`.
+    """
+    images: list[Optional[np.ndarray]] = [None] * len(file_paths)
+    if (decoder := _get_gpu_jpeg_decoder()) is None:
+        return images
+    torch, decode_jpeg = decoder
+
+    positions = []
+    data = []
+    for position, file_path in enumerate(file_paths):
+        try:
+            with Image.open(file_path) as image:
+                if image.format != "JPEG" or image.mode not in _GPU_JPEG_MODES:
+                    continue
+            data.append(torch.from_numpy(np.fromfile(file_path, dtype=np.uint8)))
+        except OSError:
+            continue
+        positions.append(position)
+
+    if not data:
+        return images
+
+    try:
+        tensors = decode_jpeg(data, device="cuda")
+    except Exception as error:
+        _module_logger.debug("Failed to decode JPEG batch on the GPU.")
+        _module_logger.debug(error)
+        return images
+
+    for position, tensor in zip(positions, tensors):
+        images[position] = _tensor_to_array(tensor)
+
+    return images
+
+
+def _tensor_to_array(tensor: Any) -> np.ndarray:
+    # Decoded tensors are CHW while Pillow arrays are HWC or HW for single channels
+    array = tensor.permute(1, 2, 0).cpu().numpy()
+    if array.shape[-1] == 1:
+        array = array[..., 0]
+
+    return np.ascontiguousarray(array)
+
+
 register_plugin(
     format=GenericImagePlugin.format,
     plugin=GenericImagePlugin,
@@ -7,6 +7,7 @@ from contextlib import suppress
 import json
 from json import JSONDecodeError
 import logging
+import math
 from pathlib import Path
 from typing import Optional
 
@@ -19,6 +20,30 @@ from histalign.io.image.metadata import OmeXml, OmeXmlChannel, UnitsLength
 
 _module_logger = logging.getLogger(__name__)
 
+# Minimum size of the chunk cache of datasets. The HDF5 default of 1 MiB is smaller
+# than a single chunk for most microscopy images, meaning chunks get read and
+# decompressed again every time they are accessed.
+DEFAULT_CHUNK_CACHE_SIZE = 64 * 2**20
+# Upper bound of the chunk cache size to avoid ballooning on huge planes
+_MAXIMUM_CHUNK_CACHE_SIZE = 2**30
+# Target size of chunks of new datasets. Small images are grouped until reaching it
+# while images larger than the maximum are split along Y.
+_TARGET_CHUNK_SIZE = 2**20
+_MAXIMUM_CHUNK_SIZE = 2**24
+# Factors converting supported length units to microns
+_TO_MICRON = {
+    UnitsLength.nano: 1e-3,
+    UnitsLength.micro: 1.0,
+    UnitsLength.milli: 1e3,
+    UnitsLength.centi: 1e4,
+    UnitsLength.inches: 25_400.0,
+}
+# Shared encoder for metadata attributes
+_JSON_ENCODER = json.JSONEncoder(separators=(",", ":"))
+# Characters a JSON document can start with, as both text and bytes
+_JSON_FIRST_CHARACTERS = frozenset('{["-0123456789tfnNI \t\n\r')
+_JSON_FIRST_CHARACTERS |= {character.encode() for character in _JSON_FIRST_CHARACTERS}
+
 
 class Hdf5ImagePlugin(MultiSeriesImageFile):
     format: str = "HDF5"
@@ -28,19 +53,36 @@ class Hdf5ImagePlugin(MultiSeriesImageFile):
 
     @property
     def shape(self) -> tuple[int, ...]:
-        return self.file_handle[self._datasets[self.series_index]].shape
+        return self.dataset.shape
 
     @property
     def dtype(self) -> np.dtype:
-        return self.file_handle[self._datasets[self.series_index]].dtype
+        return self.dataset.dtype
 
     @property
     def series_count(self) -> int:
         return len(self._datasets)
 
+    @property
+    def dataset(self) -> h5py.Dataset:
+        # Keep the dataset object around as looking it up by name goes through the
+        # file's B-tree every time and every read would otherwise pay for it.
+        name = self._datasets[self.series_index]
+        if self._current_dataset is None or self._current_dataset[0] != name:
+            self._current_dataset = (name, self._open_dataset(name))
+
+        return self._current_dataset[1]
+
     def _open(
         self, file_path: Path, mode: str, metadata: Optional[OmeXml] = None, **kwargs
     ) -> None:
+        self._current_dataset: Optional[tuple[str, h5py.Dataset]] = None
+        self._chunk_cache_size = kwargs.get(
+            "chunk_cache_size", DEFAULT_CHUNK_CACHE_SIZE
+        )
+        self._chunks: Optional[tuple[int, ...]] = kwargs.get("chunks")
+        self._compression: Optional[str] = kwargs.get("compression", "gzip")
+
         self.file_handle = h5py.File(file_path, mode)
         if mode != "r":
             if (shape := kwargs.get("shape")) is None:
@@ -52,16 +94,51 @@ class Hdf5ImagePlugin(MultiSeriesImageFile):
         self.query_datasets()
 
     def load(self) -> np.ndarray:
-        return self.file_handle[self._datasets[self.series_index]][:]
+        dataset = self.dataset
+
+        array = _memory_map_dataset(dataset)
+        if array is not None:
+            return array
+
+        # Read straight into a preallocated array to skip the selection machinery
+        array = np.empty(dataset.shape, dtype=dataset.dtype)
+        if array.size > 0:
+            dataset.read_direct(array)
+
+        return array
+
+    def _open_dataset(self, name: str) -> h5py.Dataset:
+        dataset = self.file_handle[name]
+        if dataset.chunks is None:
+            return dataset
+
+        # Reopen the dataset with a chunk cache large enough to hold all the chunks
+        # of an image so that reading neighbouring images does not read them again.
+        cache_size, slot_count = _compute_chunk_cache(
+            dataset.shape,
+            dataset.chunks,
+            dataset.dtype.itemsize,
+            self.dimension_order,
+            self._chunk_cache_size,
+        )
+        # HDF5 hands back the already open dataset, ignoring the new cache settings,
+        # until every handle to it is released.
+        del dataset
+
+        access_properties = h5py.h5p.create(h5py.h5p.DATASET_ACCESS)
+        access_properties.set_chunk_cache(slot_count, cache_size, 0.75)
+
+        return h5py.Dataset(
+            h5py.h5d.open(self.file_handle.id, name.encode(), dapl=access_properties)
+        )
 
     def close(self) -> None:
+        self._current_dataset = None
         self.file_handle.close()
         super().close()
 
     def try_get_dimension_order(self) -> Optional[DimensionOrder]:
-        dimension_order = self.file_handle[self._datasets[self.series_index]].attrs.get(
-            "DimensionOrder"
-        )
+        dimension_order = self.dataset.attrs.get("DimensionOrder")
         if dimension_order is None:
             return dimension_order
 
@@ -69,19 +146,39 @@ class Hdf5ImagePlugin(MultiSeriesImageFile):
         return dimension_order[1:-1]
 
     def read_image(self, index: tuple[slice, ...]) -> np.ndarray:
-        return self.file_handle[self._datasets[self.series_index]][index]
+        return self.dataset[index]
 
     def write_image(self, image: np.ndarray, index: tuple[slice, ...]) -> None:
-        self.file_handle[self._datasets[self.series_index]][index] = image
+        dataset = self.dataset
+
+        # Writing directly skips the broadcasting machinery of item assignment when the
+        # image fills the selection exactly.
+        if image.flags.c_contiguous and image.shape == _get_selection_shape(
+            index, dataset.shape
+        ):
+            dataset.write_direct(image, dest_sel=index)
+        else:
+            dataset[index] = image
 
     def create_series(
         self, shape: Sequence[int], dtype: np.dtype, metadata: Optional[OmeXml] = None
     ) -> None:
+        chunks = self._chunks
+        if chunks is None and self.dimension_order is not None:
+            chunks = _compute_chunks(
+                shape, np.dtype(dtype).itemsize, self.dimension_order
+            )
+
         self.file_handle.create_dataset(
             name=f"series{self.series_index}",
             shape=shape,
             dtype=dtype,
-            compression="gzip",
+            # Let h5py guess when the dimension order is not known
+            chunks=chunks or True,
+            compression=self._compression,
+            # Shuffling bytes groups the high bytes of 16-bit samples which helps
+            # compression for about no cost.
+            shuffle=self._compression is not None,
         )
         self.query_datasets()
         if metadata is not None:
@@ -92,13 +189,15 @@ class Hdf5ImagePlugin(MultiSeriesImageFile):
         self._datasets = list(self.file_handle.keys())
 
     def _add_metadata(self, metadata: OmeXml) -> None:
-        dataset = self.file_handle[self._datasets[self.series_index]]
+        dataset = self.dataset
 
         # There isn't any standard for metadata packaging in an HDF5 file for scientific
         # images (in a simple manner, i.e. no NWB). This tries to mirror the OME-XML
         # standard but we are still only compatible with ourselves.
-        for attribute_name, value in metadata.model_dump().items():
-            dataset.attrs[attribute_name] = json.dumps(value)
+        # Dumping in JSON mode also serialises enum defaults pydantic did not validate
+        encode = _JSON_ENCODER.encode
+        for attribute_name, value in metadata.model_dump(mode="json").items():
+            dataset.attrs[attribute_name] = encode(value)
 
         # Element size compatibility with HDF5 Vibez plugin for ImageJ.
         # Dimensions are read in order "depth (Z) -> height (Y) -> width (X)".
@@ -111,42 +210,34 @@ class Hdf5ImagePlugin(MultiSeriesImageFile):
         ]
 
     def _extract_metadata(self) -> OmeXml:
-        dataset = self.file_handle[self._datasets[self.series_index]]
+        dataset = self.dataset
 
         attrs = dataset.attrs
         attributes = {}
         for name, attribute in attrs.items():
-            with suppress(JSONDecodeError, TypeError):
+            # Only try decoding strings which can be JSON as going through the
+            # decoder's exception path for every other attribute is comparatively slow.
+            if (
+                not isinstance(attribute, (str, bytes))
+                or attribute[:1] not in _JSON_FIRST_CHARACTERS
+            ):
+                continue
+
+            with suppress(JSONDecodeError, UnicodeDecodeError):
                 attributes[name] = json.loads(attribute)
 
         channel_list = [
             OmeXmlChannel(**channel) for channel in attributes.get("Channel", [])
         ]
+        sizes = dict(zip(self.dimension_order.value, self.shape))
 
         return OmeXml(
             DimensionOrder=attributes.get("DimensionOrder") or self.dimension_order,
-            SizeX=attributes.get("SizeX")
-            or self.shape[self.dimension_order.value.index("X")],
-            SizeY=attributes.get("SizeY")
-            or self.shape[self.dimension_order.value.index("Y")],
-            SizeC=attributes.get("SizeC")
-            or (
-                self.shape[self.dimension_order.value.index("C")]
-                if "C" in self.dimension_order.value
-                else None
-            ),
-            SizeZ=attributes.get("SizeZ")
-            or (
-                self.shape[self.dimension_order.value.index("Z")]
-                if "Z" in self.dimension_order.value
-                else None
-            ),
-            SizeT=attributes.get("SizeT")
-            or (
-                self.shape[self.dimension_order.value.index("T")]
-                if "T" in self.dimension_order.value
-                else None
-            ),
+            SizeX=attributes.get("SizeX") or sizes["X"],
+            SizeY=attributes.get("SizeY") or sizes["Y"],
+            SizeC=attributes.get("SizeC") or sizes.get("C"),
+            SizeZ=attributes.get("SizeZ") or sizes.get("Z"),
+            SizeT=attributes.get("SizeT") or sizes.get("T"),
             Type=attributes.get("Type") or self.dtype,
             PhysicalSizeX=attributes.get("PhysicalSizeX"),
             PhysicalSizeY=attributes.get("PhysicalSizeY"),
@@ -168,23 +259,178 @@ def convert_to_microns(value: float, unit: UnitsLength) -> float:
     Returns:
         The converted value.
     """
-    match UnitsLength(unit):
-        case UnitsLength.nano:
-            return value / 1_000
-        case UnitsLength.micro:
-            return value
-        case UnitsLength.milli:
-            return value * 1_000
-        case UnitsLength.centi:
-            return value * 10_000
-        case UnitsLength.inches:
-            return value * 25_400
-        case _:
-            _module_logger.warning(
-                f"NotImplementedError: Unknown enum variant '{unit}' for conversion to "
-                f"microns. Leaving as-is."
-            )
-            return value
+    try:
+        return value * _TO_MICRON[UnitsLength(unit)]
+    except KeyError:
+        _module_logger.warning(
+            f"NotImplementedError: Unknown enum variant '{unit}' for conversion to "
+            f"microns. Leaving as-is."
+        )
+        return value
+
+
+def _compute_chunks(
+    shape: Sequence[int], itemsize: int, dimension_order: DimensionOrder
+) -> Optional[tuple[int, ...]]:
+    """Computes chunks aligned with the images of a new dataset.
+
+    Chunks span whole XY images so that reading or writing an image only touches the
+    chunks of that image. Images smaller than the target size are grouped along the
+    other dimensions, starting from the innermost one, while larger images are split
+    along Y.
+
+    Args:
+        shape (Sequence[int]): Shape of the dataset.
+        itemsize (int): Size of a single element of the dataset in bytes.
+        dimension_order (DimensionOrder): Dimension order of the dataset.
+
+    Returns:
+        The chunks or `None` if the dataset is empty.
+    """
+    if math.prod(shape) == 0:
+        return None
+
+    x_axis = dimension_order.value.index("X")
+    y_axis = dimension_order.value.index("Y")
+
+    chunks = [1] * len(shape)
+    chunks[x_axis] = shape[x_axis]
+    row_size = shape[x_axis] * itemsize
+    chunks[y_axis] = max(min(shape[y_axis], _MAXIMUM_CHUNK_SIZE // row_size), 1)
+
+    chunk_size = chunks[y_axis] * row_size
+    for axis in reversed(range(len(shape))):
+        if axis in (x_axis, y_axis):
+            continue
+
+        chunks[axis] = max(min(shape[axis], _TARGET_CHUNK_SIZE // chunk_size), 1)
+        chunk_size *= chunks[axis]
+
+    return tuple(chunks)
+
+
+def _compute_chunk_cache(
+    shape: Sequence[int],
+    chunks: Sequence[int],
+    itemsize: int,
+    dimension_order: Optional[DimensionOrder],
+    minimum_size: int,
+) -> tuple[int, int]:
+    """Computes the chunk cache size and slot count for a chunked dataset.
+
+    Args:
+        shape (Sequence[int]): Shape of the dataset.
+        chunks (Sequence[int]): Chunk shape of the dataset.
+        itemsize (int): Size of a single element of the dataset in bytes.
+        dimension_order (Optional[DimensionOrder]):
+            Dimension order of the dataset. If `None`, the last two dimensions are
+            assumed to be the image dimensions.
+        minimum_size (int): Minimum size of the cache in bytes.
+
+    Returns:
+        The size of the cache in bytes and its number of hash table slots.
+    """
+    if dimension_order is not None:
+        image_axes = [dimension_order.value.index(axis) for axis in "XY"]
+    else:
+        image_axes = list(range(len(shape)))[-2:]
+
+    chunk_size = math.prod(chunks) * itemsize
+    chunks_per_image = math.prod(
+        math.ceil(shape[axis] / chunks[axis]) for axis in image_axes
+    )
+    cache_size = min(
+        max(minimum_size, chunks_per_image * chunk_size), _MAXIMUM_CHUNK_CACHE_SIZE
+    )
+
+    # HDF5 recommends a prime number of slots, about 10 to 100 times the number of
+    # chunks which fit in the cache, to avoid collisions evicting chunks early.
+    slot_count = _next_prime(10 * max(cache_size // max(chunk_size, 1), 1))
+
+    return cache_size, slot_count
+
+
+def _next_prime(number: int) -> int:
+    """Returns the smallest prime greater than or equal to `number`."""
+    number = max(number, 2)
+    while any(number % divisor == 0 for divisor in range(2, math.isqrt(number) + 1)):
+        number += 1
+
+    return number
+
+
+def _get_selection_shape(
+    index: tuple[slice, ...], shape: Sequence[int]
+) -> Optional[tuple[int, ...]]:
+    """Computes the shape of a selection of contiguous slices.
+
+    Args:
+        index (tuple[slice, ...]): Selection to compute the shape of.
+        shape (Sequence[int]): Shape of the array the selection applies to.
+
+    Returns:
+        The shape of the selection or `None` if it is not made of one slice per
+        dimension with unit steps.
+    """
+    if len(index) != len(shape):
+        return None
+
+    selection_shape = []
+    for slice_, size in zip(index, shape):
+        if not isinstance(slice_, slice):
+            return None
+        start, stop, step = slice_.indices(size)
+        if step != 1:
+            return None
+        selection_shape.append(max(stop - start, 0))
+
+    return tuple(selection_shape)
+
+
+def _memory_map_dataset(dataset: h5py.Dataset) -> Optional[np.ndarray]:
+    """Memory-maps the data of a contiguous, uncompressed HDF5 dataset.
+
+    Only the parts of the dataset which are accessed are then read from disk. The map
+    is copy-on-write so the array can still be modified in memory without affecting the
+    file.
+
+    Args:
+        dataset (h5py.Dataset): Dataset to map.
+
+    Returns:
+        The memory-mapped array or `None` if the data cannot be mapped (e.g., it is
+        chunked or compressed).
+    """
+    if (
+        dataset.chunks is not None
+        or dataset.compression is not None
+        or dataset.external is not None
+        or dataset.is_virtual
+        or dataset.size == 0
+        or dataset.dtype.hasobject
+        or dataset.file.mode != "r"
+    ):
+        return None
+
+    # Data which was never written has no storage (the fill value is returned instead)
+    offset = dataset.id.get_offset()
+    if offset is None or dataset.id.get_storage_size() < dataset.nbytes:
+        return None
+
+    try:
+        return np.memmap(
+            dataset.file.filename,
+            dtype=dataset.dtype,
+            mode="c",
+            offset=offset,
+            shape=dataset.shape,
+        )
+    except (OSError, ValueError) as error:
+        _module_logger.debug(
+            f"Could not memory-map '{dataset.name}', reading it instead."
+        )
+        _module_logger.debug(error)
+        return None
 
 
 register_plugin(
@@ -10,11 +10,9 @@ from xml.etree import ElementTree
 
 import numpy as np
 from readlif.reader import LifFile, LifImage
-from readlif.utilities import get_xml
 
 from histalign.io.image import (
     DimensionOrder,
-    generate_indices,
     ModeNotSupportedError,
     MultiSeriesImageFile,
     register_plugin,
@@ -23,6 +21,37 @@ from histalign.io.image.metadata import ChannelColor, OmeXml, OmeXmlChannel, Uni
 
 _module_logger = logging.getLogger(__name__)
 
+# Paths looked up on every element `_parse_metadata` walks
+_CHILDREN_PATH = "./Children/Element"
+_ELEMENTS_PATH = "./Element"
+_CHILDREN_DATA_PATH = "./Children/Element/Data"
+_IMAGE_PATH = "./Data/Image"
+_DIMENSIONS_PATH = "./Data/Image/ImageDescription/Dimensions/"
+_CHANNELS_PATH = "./Data/Image/ImageDescription/Channels/ChannelDescription"
+_WIDEFIELD_CHANNELS_PATH = (
+    "./Data/Image/Attachment/LDM_Block_Widefield_Sequential/"
+    "LDM_Block_Sequential_List/ATLCameraSettingDefinition/"
+    "WideFieldChannelConfigurator/WideFieldChannelInfo"
+)
+_CAMERA_INFO_PATH = "./IndividualCameraInfoArray/IndividualCameraInfo"
+
+# Dimension orders indexed by the number of dimensions in a series minus two
+_ZCYX_DIMENSION_ORDERS = (
+    DimensionOrder("YX"),
+    DimensionOrder("CYX"),
+    DimensionOrder("ZCYX"),
+)
+
+# Colours of the most common LUTs
+_LUT_COLORS = {
+    "Red": ChannelColor(red=255, green=0, blue=0),
+    "Green": ChannelColor(red=0, green=255, blue=0),
+    "Blue": ChannelColor(red=0, green=0, blue=255),
+    "Yellow": ChannelColor(red=255, green=255, blue=0),
+    "Cyan": ChannelColor(red=0, green=255, blue=255),
+    "Magenta": ChannelColor(red=255, green=0, blue=255),
+}
+
 
 class LifImagePlugin(MultiSeriesImageFile):
     format: str = "LIF"
@@ -62,7 +91,7 @@ class LifImagePlugin(MultiSeriesImageFile):
             case 32:
                 return np.uint32
             case _:
-                raise ValueError(f"Unknown bit-depth for LIF file ({bit_depth}).")
+                raise ValueError(f"Unknown bit-depth for LIF file ({bit_depths[0]}).")
 
     @property
     def series_count(self) -> int:
@@ -81,15 +110,28 @@ class LifImagePlugin(MultiSeriesImageFile):
 
         self.file_handle = LifFile(file_path)
 
-        tree = ElementTree.fromstring(get_xml(str(file_path))[1])
-        self._all_images_metadata = _parse_metadata(tree)
+        # `LifFile` already parsed the XML header, reuse its tree instead of reading
+        # and parsing the header again.
+        self._all_images_metadata = _parse_metadata(self.file_handle.xml_root)
 
     def load(self) -> np.ndarray:
-        whole_series = np.zeros(shape=self.shape)
-        for index in generate_indices(
-            self.dimension_order, self.shape, self.dimension_order
-        ):
-            whole_series[index] = self.read_image(index)
+        # Retrieving the image builds a new `LifImage` so only do it once
+        current_image = self._current_image
+
+        whole_series = np.empty(self.shape, dtype=self.dtype)
+        # View the series as ZCYX to write frames directly, regardless of which
+        # singleton dimensions `shape` dropped.
+        frames = whole_series.reshape(
+            (
+                current_image.dims.z,
+                current_image.channels,
+                current_image.dims.y,
+                current_image.dims.x,
+            )
+        )
+        for z in range(current_image.dims.z):
+            for c in range(current_image.channels):
+                frames[z, c] = np.asarray(current_image.get_frame(t=0, z=z, c=c))
 
         return whole_series
 
@@ -97,14 +139,15 @@ class LifImagePlugin(MultiSeriesImageFile):
         return self._all_images_metadata[self.series_index].DimensionOrder
 
     def read_image(self, index: tuple[slice, ...]) -> np.ndarray:
-        frame = np.array(
+        # Wrap the frame's buffer rather than copying it again. The result is read-only.
+        frame = np.asarray(
             self._current_image.get_frame(
                 t=0,
                 z=index[-4].start if len(index) > 3 else 0,
                 c=index[-3].start if len(index) > 2 else 0,
             )
         )
-        return frame[(np.newaxis,) * (len(index) - 2)]
+        return frame.reshape((1,) * (len(index) - 2) + frame.shape)
 
     def write_image(self, image: np.ndarray, index: tuple[slice, ...]) -> None:
         raise ModeNotSupportedError(self.format, "w")
@@ -120,18 +163,22 @@ class LifImagePlugin(MultiSeriesImageFile):
         return self._all_images_metadata[self.series_index]
 
 
-def _parse_metadata(tree: ElementTree, parsed_tree: list | None = None) -> list[OmeXml]:
+def _parse_metadata(tree: ElementTree.Element) -> list[OmeXml]:
     # This function is heavily inspired by `readlif.reader.LifImage`'s parsing method
     # with appropriate changes for additional metadata where necessary.
-    if parsed_tree is None:
-        parsed_tree = []
+    parsed_tree = []
 
-    children = tree.findall("./Children/Element")
+    children = tree.findall(_CHILDREN_PATH)
     if len(children) < 1:
-        children = tree.findall("./Element")
-    for item in children:
-        has_children = len(item.findall("./Children/Element/Data")) > 0
-        is_image = len(item.findall("./Data/Image")) > 0
+        children = tree.findall(_ELEMENTS_PATH)
+
+    # Walk the tree depth-first with an explicit stack rather than recursion. Elements
+    # are pushed in reverse so that images come out in the same order as readlif's.
+    stack = children[::-1]
+    while stack:
+        item = stack.pop()
+        has_children = item.find(_CHILDREN_DATA_PATH) is not None
+        is_image = item.find(_IMAGE_PATH) is not None
 
         if is_image:
             # Known dimension IDs are:
@@ -141,38 +188,28 @@ def _parse_metadata(tree: ElementTree, parsed_tree: list | None = None) -> list[
             # 4: T
             # Channels are not considered a dimension in LIF metadata.
 
-            # Dimensions information
-            dimensions = item.findall("./Data/Image/ImageDescription/Dimensions/")
-
-            dimensions_dictionary = {
-                int(dimension.attrib["DimID"]): int(
-                    dimension.attrib["NumberOfElements"]
-                )
-                for dimension in dimensions
-            }
-
-            # Scale information
+            # Dimensions and scale information
+            dimensions_dictionary = {}
             scale_dictionary = {}
-            for dimension in dimensions:
-                dimension_id = int(dimension.attrib["DimID"])
+            for dimension in item.iterfind(_DIMENSIONS_PATH):
+                attributes = dimension.attrib
+                dimension_id = int(attributes["DimID"])
+                element_count = int(attributes["NumberOfElements"])
+                dimensions_dictionary[dimension_id] = element_count
 
                 try:
-                    length = float(dimension.attrib["Length"])
+                    length = float(attributes["Length"])
 
                     if dimension_id < 4:
-                        # Pixel per micrometer
-                        value = (int(dimensions_dictionary[dimension_id]) - 1) / (
-                            float(length) * 10**6
-                        )  # XML is in meters
+                        # Pixel per micrometer (XML is in meters)
+                        value = (element_count - 1) / (length * 10**6)
                         # Micrometer per pixel
                         scale_dictionary[dimension_id] = 1 / value
                 except (AttributeError, ZeroDivisionError):
                     scale_dictionary[dimension_id] = None
 
             # Channel information
-            channels = item.findall(
-                "./Data/Image/ImageDescription/Channels/ChannelDescription"
-            )
+            channels = item.findall(_CHANNELS_PATH)
             channel_count = len(channels)
 
             bit_depths = tuple(
@@ -193,22 +230,14 @@ def _parse_metadata(tree: ElementTree, parsed_tree: list | None = None) -> list[
                 )
                 bit_depth = max(bit_depths)
 
-            channel_list = []
-            for index, channel in enumerate(
-                item.findall(
-                    "./Data/Image/Attachment/LDM_Block_Widefield_Sequential/"
-                    "LDM_Block_Sequential_List/ATLCameraSettingDefinition/"
-                    "WideFieldChannelConfigurator/WideFieldChannelInfo"
-                )
-            ):
+            channels_xml = []
+            for index, channel in enumerate(item.iterfind(_WIDEFIELD_CHANNELS_PATH)):
                 try:
                     channel_name = channel.attrib["UserDefName"]
                 except AttributeError:
                     channel_name = f"channel{index}"
 
-                channel_info = channel.findall(
-                    "./IndividualCameraInfoArray/IndividualCameraInfo"
-                )
+                channel_info = channel.findall(_CAMERA_INFO_PATH)
                 if len(channel_info) > 1:
                     _module_logger.warning(
                         "Encountered multiple channel info element while parsing LIF "
@@ -218,28 +247,25 @@ def _parse_metadata(tree: ElementTree, parsed_tree: list | None = None) -> list[
                     channel_lut = None
                     channel_emission_wavelength = None
                 else:
-                    channel_lut = channel_info[0].attrib.get("LUT")
+                    channel_attributes = channel_info[0].attrib
+                    channel_lut = channel_attributes.get("LUT")
                     try:
                         channel_emission_wavelength = int(
-                            channel_info[0].attrib["EmissionWavelength"]
+                            channel_attributes["EmissionWavelength"]
                         )
                     except (AttributeError, TypeError):
                         channel_emission_wavelength = None
 
-                channel_list.append(
-                    {
-                        "Name": channel_name,
-                        "EmissionWavelength": channel_emission_wavelength,
+                channels_xml.append(
+                    OmeXmlChannel(
+                        Name=channel_name,
+                        EmissionWavelength=channel_emission_wavelength,
                         # Unit not in metadata, assuming nanometers
-                        "EmissionWavelengthUnit": "nm",
-                        "Color": convert_lut_to_color(channel_lut),
-                    }
+                        EmissionWavelengthUnit="nm",
+                        Color=convert_lut_to_color(channel_lut),
+                    )
                 )
 
-            channels_xml = []
-            for channel in channel_list:
-                channels_xml.append(OmeXmlChannel(**channel))
-
             # Determines how many dimensions are included in the current series. This
             # is used to determine how far from the end of the "ZCYX" list of dimensions
             # to start from when figuring out the correct DimensionOrder. See above for
@@ -247,11 +273,11 @@ def _parse_metadata(tree: ElementTree, parsed_tree: list | None = None) -> list[
             dimension_order_back_index = 2
             if channel_count:
                 dimension_order_back_index = 3
-            if 3 in dimensions_dictionary.keys():
+            if 3 in dimensions_dictionary:
                 dimension_order_back_index = 4
 
             ome_xml = OmeXml(
-                DimensionOrder=DimensionOrder("ZCYX"[-dimension_order_back_index:]),
+                DimensionOrder=_ZCYX_DIMENSION_ORDERS[dimension_order_back_index - 2],
                 SizeX=dimensions_dictionary.get(1, 1),
                 SizeY=dimensions_dictionary.get(2, 1),
                 SizeC=channel_count or 1,
@@ -270,28 +296,17 @@ def _parse_metadata(tree: ElementTree, parsed_tree: list | None = None) -> list[
             parsed_tree.append(ome_xml)
 
         if has_children:
-            _parse_metadata(item, parsed_tree)
+            stack.extend(reversed(item.findall(_CHILDREN_PATH)))
 
     return parsed_tree
 
 
 def convert_lut_to_color(lut: str) -> ChannelColor:
     # Support most common colours, default to white otherwise
-    match lut:
-        case "Red":
-            return ChannelColor(red=255, green=0, blue=0)
-        case "Green":
-            return ChannelColor(red=0, green=255, blue=0)
-        case "Blue":
-            return ChannelColor(red=0, green=0, blue=255)
-        case "Yellow":
-            return ChannelColor(red=255, green=255, blue=0)
-        case "Cyan":
-            return ChannelColor(red=0, green=255, blue=255)
-        case "Magenta":
-            return ChannelColor(red=255, green=0, blue=255)
-        case _:
-            return ChannelColor()
+    try:
+        return _LUT_COLORS[lut]
+    except KeyError:
+        return ChannelColor()
 
 
 register_plugin(
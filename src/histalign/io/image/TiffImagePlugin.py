@@ -5,7 +5,6 @@
 from fractions import Fraction
 import logging
 from pathlib import Path
-import re
 from typing import Optional
 
 import numpy as np
@@ -18,6 +17,21 @@ from histalign.io.image.metadata import OmeXml, OmeXmlChannel, UnitsLength
 
 _module_logger = logging.getLogger(__name__)
 
+# RESUNIT variants with an OME equivalent. NONE is deliberately left out so that it
+# goes through the warning path.
+_RESOLUTION_UNITS = {
+    RESUNIT.INCH: UnitsLength.inches,
+    RESUNIT.CENTIMETER: UnitsLength.centi,
+    RESUNIT.MILLIMETER: UnitsLength.milli,
+    RESUNIT.MICROMETER: UnitsLength.micro,
+}
+_IMAGEJ_Z_UNITS = {
+    "um": UnitsLength.micro,
+    "in": UnitsLength.inches,
+}
+# Axes of `tifffile` series which can be converted to a DimensionOrder
+_SUPPORTED_AXES = frozenset("XYZCSQ")
+
 
 class TiffImagePlugin(ImageFile):
     format: str = "TIFF"
@@ -36,13 +50,23 @@ class TiffImagePlugin(ImageFile):
     def dtype(self) -> np.dtype:
         return self.file_handle.dtype
 
+    @property
+    def _file_handle(self) -> tifffile.TiffFile:
+        # Only parse a file being written when its metadata is actually needed
+        if self._tiff_file is None:
+            self._tiff_file = tifffile.TiffFile(self.file_path)
+
+        return self._tiff_file
+
     def _open(
         self, file_path: Path, mode: str, metadata: Optional[OmeXml] = None, **kwargs
     ) -> None:
+        self._tiff_file: Optional[tifffile.TiffFile] = None
+
         if mode == "r":
-            self.file_handle = tifffile.TiffFile(file_path, mode="r").asarray(
-                out="memmap"
-            )
+            # Parse the file once and keep it around for metadata parsing
+            self._tiff_file = tifffile.TiffFile(file_path, mode="r")
+            self.file_handle = self._tiff_file.asarray(out="memmap")
         else:
             if (shape := kwargs.get("shape")) is None:
                 raise ValueError("No shape provided for new file in writing mode.")
@@ -69,12 +93,15 @@ class TiffImagePlugin(ImageFile):
                 metadata=metadata,
             )
 
-        # Kept for metadata parsing
-        self._file_handle = tifffile.TiffFile(file_path)
-
     def load(self) -> np.ndarray:
         return self.file_handle[:]
 
+    def close(self) -> None:
+        if self._tiff_file is not None:
+            self._tiff_file.close()
+            self._tiff_file = None
+        super().close()
+
     def try_get_dimension_order(self) -> Optional[DimensionOrder]:
         return convert_tiff_axes_to_dimension_order(self._file_handle.series[0].axes)
 
@@ -85,33 +112,20 @@ class TiffImagePlugin(ImageFile):
         self.file_handle[index] = image
 
     def _extract_metadata(self) -> OmeXml:
+        sizes = dict(zip(self.dimension_order.value, self.shape))
+
         # As far as I'm aware, channel metadata cannot be stored in TIFF tags
-        c_size = (
-            self.shape[self.dimension_order.value.index("C")]
-            if "C" in self.dimension_order.value
-            else 0
-        )
-        channel_list = [OmeXmlChannel(Name=f"channel{i + 1}") for i in range(c_size)]
+        channel_list = [
+            OmeXmlChannel(Name=f"channel{i + 1}") for i in range(sizes.get("C", 0))
+        ]
 
         return OmeXml(
             DimensionOrder=self.dimension_order,
-            SizeX=self.shape[self.dimension_order.value.index("X")],
-            SizeY=self.shape[self.dimension_order.value.index("Y")],
-            SizeC=(
-                self.shape[self.dimension_order.value.index("C")]
-                if "C" in self.dimension_order.value
-                else None
-            ),
-            SizeZ=(
-                self.shape[self.dimension_order.value.index("Z")]
-                if "Z" in self.dimension_order.value
-                else None
-            ),
-            SizeT=(
-                self.shape[self.dimension_order.value.index("T")]
-                if "T" in self.dimension_order.value
-                else None
-            ),
+            SizeX=sizes["X"],
+            SizeY=sizes["Y"],
+            SizeC=sizes.get("C"),
+            SizeZ=sizes.get("Z"),
+            SizeT=sizes.get("T"),
             Type=self.dtype,
             # TIFF stores sizes in unit/pixel, hence invert the fraction
             PhysicalSizeX=float(
@@ -163,28 +177,21 @@ def convert_tiff_resolution_unit_to_ome(value: RESUNIT) -> UnitsLength:
         TIFF tags specs: https://web.archive.org/web/20200809235709/https://www.awaresystems.be/imaging/tiff/tifftags/resolutionunit.html
         `tifffile` enum: https://github.com/cgohlke/tifffile/blob/8a25a0d4738390af0a1f693705f29875d88fc320/tifffile/tifffile.py#L17285
     """
-    match value:
-        case RESUNIT.NONE:
-            converted = UnitsLength.micro
+    try:
+        return _RESOLUTION_UNITS[value]
+    except KeyError:
+        converted = UnitsLength.micro
+        if value == RESUNIT.NONE:
             _module_logger.warning(
                 f"Encountered OME-incompatible, TIFF '{value}' resolution unit. "
                 f"Defaulting to '{converted}'."
             )
-        case RESUNIT.INCH:
-            converted = UnitsLength.inches
-        case RESUNIT.CENTIMETER:
-            converted = UnitsLength.centi
-        case RESUNIT.MILLIMETER:
-            converted = UnitsLength.milli
-        case RESUNIT.MICROMETER:
-            converted = UnitsLength.micro
-        case _:
-            converted = UnitsLength.micro
+        else:
             _module_logger.warning(
                 f"Unknown RESUNIT variant '{value}'. " f"Defaulting to '{converted}'."
             )
 
-    return converted
+        return converted
 
 
 def convert_imagej_tiff_z_unit_to_ome(value: str) -> UnitsLength:
@@ -198,17 +205,14 @@ def convert_imagej_tiff_z_unit_to_ome(value: str) -> UnitsLength:
     """
     # I'm not aware of any documentation of the possible values of the spacing unit (it
     # might even be user-defined), hence try to support the most common ones.
-    match value:
-        case "um":
-            return UnitsLength.micro
-        case "in":
-            return UnitsLength.inches
-        case _:
-            _module_logger.warning(
-                f"Encountered unknown Z resolution unit '{value}' while parsing TIFF "
-                f"metadata. Assuming µm."
-            )
-            return UnitsLength.micro
+    try:
+        return _IMAGEJ_Z_UNITS[value]
+    except KeyError:
+        _module_logger.warning(
+            f"Encountered unknown Z resolution unit '{value}' while parsing TIFF "
+            f"metadata. Assuming µm."
+        )
+        return UnitsLength.micro
 
 
 def convert_tiff_axes_to_dimension_order(axes: str) -> Optional[DimensionOrder]:
@@ -225,8 +229,7 @@ def convert_tiff_axes_to_dimension_order(axes: str) -> Optional[DimensionOrder]:
         `tifffile`'s axes legend: https://github.com/cgohlke/tifffile/blob/78b57cf84bd92528ba8877ea4972769bb4d43600/tifffile/tifffile.py#L18594-L18618
     """
     # Check axes only contains supported dimensions
-    match = re.fullmatch(r"^[XYZCSQ]+$", axes)
-    if match is None:
+    if not axes or not _SUPPORTED_AXES.issuperset(axes):
         return None
 
     # We cast S to C and  to Q, hence ensure both versions of each aren't prevent
@@ -4,10 +4,12 @@
 
 from abc import ABC, abstractmethod
 from enum import Enum
+from functools import cached_property, lru_cache
 import hashlib
+from itertools import product
 import logging
 from pathlib import Path
-from typing import Any, Iterator, Optional, Sequence, TypeVar
+from typing import Any, Hashable, Iterator, Optional, Sequence, TypeVar
 
 import click
 import numpy as np
@@ -23,6 +25,8 @@ SUPPORTED_READ_FORMATS: list[Format] = []
 SUPPORTED_WRITE_FORMATS: list[Format] = []
 PLUGINS: dict[Format, type["ImageFile"]] = {}
 EXTENSIONS: dict[Extension, Format] = {}
+# Inverse of EXTENSIONS, kept up to date when registering plugins
+FORMAT_EXTENSIONS: dict[Format, list[Extension]] = {}
 
 # A dimension with 4 or fewer size is considered C. Between 5 and 49 (inclusive) is
 # considered a Z. Anything 50 and above is considered a Y and then an X (from left to
@@ -41,20 +45,12 @@ def list_formats() -> None:
     """Lists the supported formats currently registered."""
     click.echo("Supported file formats for reading:")
     for supported_format in SUPPORTED_READ_FORMATS:
-        extensions = (
-            extension
-            for extension, format in EXTENSIONS.items()
-            if format == supported_format
-        )
+        extensions = FORMAT_EXTENSIONS.get(supported_format, ())
         click.echo(f"\t{supported_format} ({', '.join(extensions)})")
 
     click.echo("Supported file formats for writing:")
     for supported_format in SUPPORTED_WRITE_FORMATS:
-        extensions = (
-            extension
-            for extension, format in EXTENSIONS.items()
-            if format == supported_format
-        )
+        extensions = FORMAT_EXTENSIONS.get(supported_format, ())
         click.echo(f"\t{supported_format} ({', '.join(extensions)})")
 
 
@@ -88,7 +84,13 @@ def get_appropriate_plugin_class(
     Raises:
         ModeNotSupportedError: When the mode provided does not have a matching plugin.
     """
-    suffixes = file_path.suffixes
+    return _find_plugin_class(tuple(file_path.suffixes), mode)
+
+
+@lru_cache(maxsize=64)
+def _find_plugin_class(suffixes: tuple[str, ...], mode: str) -> type["ImageFile"]:
+    # Cached as projects open the same few file types over and over. The cache is
+    # cleared whenever a plugin is registered.
     for i in range(len(suffixes)):
         current_combination = "".join(suffixes[i:])
 
@@ -158,8 +160,12 @@ def register_plugin(
                 f"Keeping the latest registration "
                 f"(previous format: {EXTENSIONS.get(extension)}, new format: {format})."
             )
+            FORMAT_EXTENSIONS[EXTENSIONS[extension]].remove(extension)
 
         EXTENSIONS[extension] = format
+        FORMAT_EXTENSIONS.setdefault(format, []).append(extension)
+
+    _find_plugin_class.cache_clear()
 
     _module_logger.debug(f"Registered '{format}' format.")
 
@@ -237,6 +243,7 @@ class ImageFile(ABC):
         **kwargs,
     ) -> None:
         self.file_path = file_path
+        self._metadata_cache: dict[Hashable, "OmeXml"] = {}
 
         if dimension_order is None and mode == "w":
             raise ValueError(
@@ -275,7 +282,7 @@ class ImageFile(ABC):
         if self.dimension_order is not None:
             self.reset_index()
 
-    @property
+    @cached_property
     def hash(self) -> str:
         return generate_file_hash(self.file_path)
 
@@ -289,7 +296,18 @@ class ImageFile(ABC):
 
     @property
     def metadata(self) -> "OmeXml":
-        return self._extract_metadata()
+        # Extracting can involve parsing the whole file header so only do it once.
+        # Callers copy the metadata before modifying it.
+        key = self._metadata_key
+        metadata = self._metadata_cache.get(key)
+        if metadata is None:
+            metadata = self._metadata_cache[key] = self._extract_metadata()
+
+        return metadata
+
+    @property
+    def _metadata_key(self) -> Hashable:
+        return self.dimension_order
 
     @classproperty
     def supports_series(cls) -> bool:
@@ -308,8 +326,15 @@ class ImageFile(ABC):
     def load(self) -> np.ndarray: ...
 
     def close(self) -> None:
+        self._metadata_cache.clear()
         self.file_handle = DeferredError(ValueError("Operation on closed file."))
 
+    def __enter__(self) -> "ImageFile":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
     def generate_thumbnail(
         self, dimensions: tuple[int, int] = THUMBNAIL_DIMENSIONS
     ) -> np.ndarray:
@@ -434,6 +459,10 @@ class MultiSeriesImageFile(ImageFile, ABC):
     def has_another_series(self) -> bool:
         return self.series_index < self.series_count - 1
 
+    @property
+    def _metadata_key(self) -> Hashable:
+        return self.series_index, self.dimension_order
+
     @abstractmethod
     def create_series(
         self, shape: Sequence[int], dtype: np.dtype, metadata: Optional["OmeXml"] = None
@@ -450,6 +479,8 @@ class MultiSeriesImageFile(ImageFile, ABC):
             self.series_index += 1  # Necessary for some types to name new series
             self.create_series(shape=shape, dtype=dtype, metadata=metadata)
             self.series_index -= 1  # Avoid 'else' by subtracting here and resuming flow
+            # Series indices can point to different series once a new one is added
+            self._metadata_cache.clear()
 
         self.series_index += 1
 
@@ -590,15 +621,18 @@ def _generate_indices(
     index_blueprint: list[slice],
     order_of_operations: list[int],
 ) -> Iterator[tuple[slice, ...]]:
-    if not order_of_operations:
-        yield tuple(index_blueprint)
-        return
-
-    order_of_operation = order_of_operations[0]
-    for i in range(shape[order_of_operation]):
-        index_blueprint[order_of_operation] = slice(i, i + 1)
+    # Iterating the nested loops with `product` avoids a generator per nesting level
+    # and only builds each slice once.
+    dimension_slices = [
+        [slice(i, i + 1) for i in range(shape[order_of_operation])]
+        for order_of_operation in order_of_operations
+    ]
+    index = list(index_blueprint)
+    for slices in product(*dimension_slices):
+        for order_of_operation, slice_ in zip(order_of_operations, slices):
+            index[order_of_operation] = slice_
 
-        yield from _generate_indices(shape, index_blueprint, order_of_operations[1:])
+        yield tuple(index)
 
 
 def translate_between_orders(
@@ -622,19 +656,10 @@ def translate_between_orders(
     Raises:
         ValueError: When `to_order` has dimensions that are not present in `from_order`.
     """
-    pruned_sequence = remove_extra_dimensions(sequence, from_order, to_order)
-    pruned_from_order = remove_extra_dimensions(from_order.value, from_order, to_order)
-
-    if len(pruned_from_order) < len(to_order.value):
-        raise ValueError(
-            f"Cannot translate sequence from "
-            f"'{from_order.value}' to '{to_order.value}'. "
-            f"Dimensions should not be added (but can be removed)."
-        )
+    _check_sequence_length(sequence, from_order)
 
     return tuple(
-        pruned_sequence[pruned_from_order.index(dimension)]
-        for dimension in to_order.value
+        sequence[index] for index in _get_translation_indices(from_order, to_order)
     )
 
 
@@ -656,21 +681,47 @@ def remove_extra_dimensions(
     Returns:
         The pruned sequence.
     """
-    if len(sequence) != len(from_order.value):
+    _check_sequence_length(sequence, from_order)
+
+    return tuple(
+        sequence[index] for index in _get_pruning_indices(from_order, to_order)
+    )
+
+
+def _check_sequence_length(sequence: Sequence, order: DimensionOrder) -> None:
+    if len(sequence) != len(order.value):
         raise ValueError(
             f"`sequence` length does not match `from_order` length "
             f"({sequence}: {len(sequence)} "
-            f"vs {from_order.value}: {len(from_order.value)})."
+            f"vs {order.value}: {len(order.value)})."
+        )
+
+
+# Orders only come in a few combinations while sequences are translated for every
+# image when converting so only work out where each item goes once.
+@lru_cache(maxsize=None)
+def _get_translation_indices(
+    from_order: DimensionOrder, to_order: DimensionOrder
+) -> tuple[int, ...]:
+    if any(dimension not in from_order.value for dimension in to_order.value):
+        raise ValueError(
+            f"Cannot translate sequence from "
+            f"'{from_order.value}' to '{to_order.value}'. "
+            f"Dimensions should not be added (but can be removed)."
         )
 
-    pruned_sequence = ()
-    for index, value in enumerate(sequence):
-        if from_order.value[index] not in to_order.value:
-            continue
+    return tuple(from_order.value.index(dimension) for dimension in to_order.value)
 
-        pruned_sequence += (value,)
 
-    return pruned_sequence
+@lru_cache(maxsize=None)
+def _get_pruning_indices(
+    from_order: DimensionOrder, to_order: DimensionOrder
+) -> tuple[int, ...]:
+    return tuple(
+        index
+        for index, dimension in enumerate(from_order.value)
+        if dimension in to_order.value
+    )
 
 
 def attempt_guess_dimension_order(shape: Sequence[int]) -> DimensionOrder:
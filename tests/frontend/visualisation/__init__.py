@@ -0,0 +1,3 @@
+# SPDX-FileCopyrightText: 2025-present Olivier Delrée <olivierdelree@protonmail.com>
+#
+# SPDX-License-Identifier: MIT
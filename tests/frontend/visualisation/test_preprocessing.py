@@ -0,0 +1,43 @@
+# SPDX-FileCopyrightText: 2025-present Olivier Delrée <olivierdelree@protonmail.com>
+#
+# SPDX-License-Identifier: MIT
+
+import numpy as np
+import pytest
+
+from histalign.backend.maths import normalise_array
+from histalign.frontend.visualisation import _quantise_volume
+
+
+@pytest.mark.parametrize(
+    "volume",
+    [
+        np.random.default_rng(0).integers(0, 2**16, (16, 24, 32), dtype=np.uint16),
+        np.random.default_rng(1).integers(1_000, 1_200, (16, 24, 32), dtype=np.uint16),
+        np.full((4, 4, 4), 7, dtype=np.uint16),
+    ],
+)
+def test_quantisation(volume: np.ndarray) -> None:
+    """Tests quantisation matches the original normalise/digitize pipeline."""
+    mask = np.random.default_rng(2).integers(0, 2, volume.shape).astype(bool)
+
+    expected = normalise_array(volume, dtype=np.dtype(np.uint8))
+    expected = np.digitize(expected, np.linspace(0, 255, 25)).astype(np.uint8)
+    expected = normalise_array(expected, dtype=np.dtype(np.uint8))
+    expected = np.where(mask, expected, 0)
+
+    quantised = _quantise_volume(volume, mask)
+
+    assert quantised.dtype == np.uint8
+    assert np.array_equal(quantised, expected)
+
+
+def test_quantisation_range() -> None:
+    """Tests quantised volumes span the whole 8-bit range in 25 levels."""
+    volume = np.arange(2**16, dtype=np.uint16).reshape(2**8, 2**8, 1)
+
+    quantised = _quantise_volume(volume)
+
+    assert quantised.min() == 0
+    assert quantised.max() == 2**8 - 1
+    assert len(np.unique(quantised)) == 25
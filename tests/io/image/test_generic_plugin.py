@@ -0,0 +1,116 @@
+# SPDX-FileCopyrightText: 2025-present Olivier Delrée <olivierdelree@protonmail.com>
+#
+# SPDX-License-Identifier: MIT
+
+import io
+from pathlib import Path
+
+import cv2
+import numpy as np
+from PIL import Image
+import pytest
+
+from histalign.io.image.GenericImagePlugin import (
+    GenericImagePlugin,
+    _encode_png_in_strips,
+)
+
+# Channel counts mapped to the conversion from OpenCV's channel order when decoding
+_OPENCV_DECODINGS = {
+    1: None,
+    3: cv2.COLOR_BGR2RGB,
+    4: cv2.COLOR_BGRA2RGBA,
+}
+
+
+def _build_image(
+    dtype: type, channels: int, height: int, width: int = 29
+) -> np.ndarray:
+    shape = (height, width) if channels == 1 else (height, width, channels)
+    image = np.random.default_rng(channels).integers(
+        0, np.iinfo(dtype).max, shape, dtype=dtype, endpoint=True
+    )
+    # Include the extremes so that the Sub filter has to wrap around
+    image.flat[0] = np.iinfo(dtype).max
+    image.flat[-1] = 0
+
+    return image
+
+
+@pytest.mark.parametrize("dtype", [np.uint8, np.uint16])
+@pytest.mark.parametrize("channels", [1, 3, 4])
+@pytest.mark.parametrize("compression_level", [-1, 0, 9])
+@pytest.mark.parametrize(
+    "height,strip_count",
+    [
+        # Single strip
+        (16, 1),
+        # Height not divisible by the strip count
+        (37, 8),
+        # Fewer rows than strips
+        (5, 8),
+    ],
+)
+def test_strip_encoding_round_trip(
+    dtype: type, channels: int, compression_level: int, height: int, strip_count: int
+) -> None:
+    """Tests PNGs encoded in strips decode back to the original image."""
+    image = _build_image(dtype, channels, height)
+
+    encoded = _encode_png_in_strips(image, compression_level, strip_count)
+
+    decoded = cv2.imdecode(
+        np.frombuffer(encoded, dtype=np.uint8), cv2.IMREAD_UNCHANGED
+    )
+    assert decoded is not None
+    if (conversion := _OPENCV_DECODINGS[channels]) is not None:
+        decoded = cv2.cvtColor(decoded, conversion)
+    assert decoded.dtype == image.dtype
+    assert np.array_equal(decoded, image)
+
+    # Pillow reduces 16-bit colour images to 8 bits so only check what it can decode
+    # losslessly.
+    if dtype == np.uint8 or channels == 1:
+        with Image.open(io.BytesIO(encoded)) as decoded_image:
+            decoded_image.load()
+            decoded = np.array(decoded_image).astype(image.dtype)
+        assert np.array_equal(decoded, image)
+
+
+@pytest.mark.parametrize("channels", [1, 3, 4])
+@pytest.mark.parametrize("dtype", [np.uint8, np.uint16])
+def test_decoding_matches_pillow(dtype: type, channels: int, tmp_path: Path) -> None:
+    """Tests images decode to the same array as Pillow would decode them to."""
+    image = _build_image(dtype, channels, 16)
+    if (conversion := _OPENCV_DECODINGS[channels]) is not None:
+        # Both conversions only swap the red and blue channels back
+        image = cv2.cvtColor(image, conversion)
+    path = tmp_path / "test.png"
+    cv2.imwrite(str(path), image)
+
+    with Image.open(path) as expected_image:
+        expected = np.array(expected_image)
+    with GenericImagePlugin(path, "r", None) as file:
+        decoded = file.read_image(tuple())
+
+    assert decoded.dtype == expected.dtype
+    assert np.array_equal(decoded, expected)
+
+
+@pytest.mark.parametrize("channels", [1, 3, 4])
+@pytest.mark.parametrize("dtype", [np.uint8, np.uint16])
+def test_header_layout_matches_decoding(
+    dtype: type, channels: int, tmp_path: Path
+) -> None:
+    """Tests the layout read from the header matches the decoded image."""
+    path = tmp_path / "test.png"
+    cv2.imwrite(str(path), _build_image(dtype, channels, 16))
+
+    with GenericImagePlugin(path, "r", None) as file:
+        header_shape = file.shape
+        header_dtype = file.dtype
+
+        image = file.read_image(tuple())
+
+    assert header_shape == image.shape
+    assert header_dtype == image.dtype
@@ -0,0 +1,73 @@
+# SPDX-FileCopyrightText: 2025-present Olivier Delrée <olivierdelree@protonmail.com>
+#
+# SPDX-License-Identifier: MIT
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+pytest.importorskip("zarr")
+
+from histalign.io import DimensionOrder
+from histalign.io.image import generate_indices
+from histalign.io.image.metadata import OmeXml
+from histalign.io.image.ZarrImagePlugin import ZarrImagePlugin
+
+
+def _build_metadata(shape: tuple[int, ...]) -> OmeXml:
+    return OmeXml(
+        DimensionOrder=DimensionOrder.ZCYX,
+        SizeZ=shape[0],
+        SizeC=shape[1],
+        SizeY=shape[2],
+        SizeX=shape[3],
+        Type="uint16",
+        PhysicalSizeX=0.5,
+        Channel=[],
+    )
+
+
+def test_round_trip(tmp_path: Path) -> None:
+    """Tests images written to a Zarr store are read back unchanged."""
+    series = [
+        np.random.default_rng(0).integers(0, 2**16, (3, 2, 24, 32), dtype=np.uint16),
+        np.random.default_rng(1).integers(0, 2**16, (2, 2, 16, 8), dtype=np.uint16),
+    ]
+    path = tmp_path / "test.zarr"
+
+    with ZarrImagePlugin(
+        path,
+        "w",
+        DimensionOrder.ZCYX,
+        metadata=_build_metadata(series[0].shape),
+        shape=series[0].shape,
+        dtype=series[0].dtype,
+    ) as file:
+        for series_index, images in enumerate(series):
+            if series_index > 0:
+                file.seek_next_series(
+                    shape=images.shape,
+                    dtype=images.dtype,
+                    metadata=_build_metadata(images.shape),
+                )
+
+            for index in generate_indices(DimensionOrder.ZCYX, images.shape):
+                file.write_image(images[index], index)
+
+    with ZarrImagePlugin(path, "r", DimensionOrder.ZCYX) as file:
+        assert file.series_count == len(series)
+
+        for series_index, images in enumerate(series):
+            if series_index > 0:
+                file.seek_next_series()
+
+            assert file.dtype == images.dtype
+            assert np.array_equal(file.load(), images)
+            for index in generate_indices(DimensionOrder.ZCYX, images.shape):
+                assert np.array_equal(file.read_image(index), images[index])
+
+            metadata = file.metadata
+            assert metadata.SizeX == images.shape[3]
+            assert metadata.SizeC == images.shape[1]
+            assert metadata.PhysicalSizeX == 0.5